@@ -0,0 +1,85 @@
+# backend/app/api/admin.py
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.profiling import (
+    ADMIN_PREFIX,
+    get_profile_path,
+    is_authorized,
+    list_profiles,
+    profiling_state,
+)
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+
+
+def require_profiling_token(request: Request):
+    """Admin endpoints need X-Profile-Token; they do not exist without a token configured"""
+    if not settings.profiling_token:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not is_authorized(request.headers):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+router = APIRouter(
+    prefix=ADMIN_PREFIX,
+    tags=["admin"],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+class ProfilingConfig(BaseModel):
+    # Fraction of requests under `paths` to profile; 0 disables sampling
+    sample_rate: float = Field(..., ge=0.0, le=1.0)
+    # None keeps the current path prefixes
+    paths: Optional[List[str]] = None
+    # Stop sampling after this many profiles; None samples indefinitely
+    remaining: Optional[int] = Field(default=None, ge=0)
+
+
+class ProfilingStatus(BaseModel):
+    sample_rate: float
+    paths: List[str]
+    remaining: Optional[int] = None
+
+
+class ProfileInfo(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
+
+
+@router.get("", response_model=ProfilingStatus)
+def get_profiling_status():
+    return profiling_state.as_dict()
+
+
+@router.put("", response_model=ProfilingStatus)
+def configure_profiling(config: ProfilingConfig):
+    """
+    Profile a fraction of requests, e.g. {"sample_rate": 0.1, "paths": ["/qa"],
+    "remaining": 20} profiles one in ten /qa requests until 20 are captured.
+    Not persisted: restarts fall back to the profiling_* settings.
+    """
+    profiling_state.configure(config.sample_rate, config.paths, config.remaining)
+    return profiling_state.as_dict()
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+def get_profiles():
+    """Captured profiles, newest first"""
+    return list_profiles()
+
+
+@router.get("/profiles/{name}")
+def download_profile(name: str):
+    """
+    Collapsed stacks ("frame;frame;... count" lines), e.g.
+    `flamegraph.pl profile.folded > profile.svg` or open it in speedscope.
+    """
+    path = get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
@@ -1,9 +1,25 @@
 # backend/app/api/history.py
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.schemas import HistoryCreate, HistoryResponse
-from app.crud.history import create_history, list_histories, get_history
-from app.core.database import get_db
+from app.models.schemas import (
+    HistoryCreate,
+    HistoryResponse,
+    HistoryTurnCreate,
+    HistoryTurnResponse,
+)
+from app.crud.history import (
+    append_turn,
+    create_history,
+    list_histories_async,
+    list_turns_async,
+    list_histories_page_async,
+    get_history_async,
+)
+from app.crud.pagination import parse_fields
+from app.core.database import get_async_db, get_db
+from app.core.responses import projected_response
 
 router = APIRouter(prefix="/history", tags=["history"])
 
@@ -12,12 +28,59 @@ def save_history(history: HistoryCreate, db: Session = Depends(get_db)):
     return create_history(db, history.conversation)
 
 @router.get("", response_model=list[HistoryResponse])
-def get_all_histories(db: Session = Depends(get_db)):
-    return list_histories(db)
+async def get_all_histories(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        selected = parse_fields(fields, HistoryResponse.model_fields)
+        if limit is None:
+            histories = await list_histories_async(db)
+        else:
+            histories, next_cursor = await list_histories_page_async(
+                db, limit, cursor, selected
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if selected is not None:
+        return projected_response(
+            [{key: getattr(h, key) for key in selected} for h in histories], response
+        )
+    return histories
 
 @router.get("/{history_id}", response_model=HistoryResponse)
-def read_history(history_id: str, db: Session = Depends(get_db)):
-    h = get_history(db, history_id)
+async def read_history(history_id: str, db: AsyncSession = Depends(get_async_db)):
+    h = await get_history_async(db, history_id)
     if not h:
        raise HTTPException(status_code=404, detail="History not found")
     return h
+
+@router.post("/{history_id}/turns", response_model=HistoryTurnResponse, status_code=201)
+def add_turn(history_id: str, turn: HistoryTurnCreate, db: Session = Depends(get_db)):
+    # Append one message instead of re-saving the whole conversation
+    t = append_turn(db, history_id, turn.role, turn.content)
+    if not t:
+        raise HTTPException(status_code=404, detail="History not found")
+    return t
+
+@router.get("/{history_id}/turns", response_model=list[HistoryTurnResponse])
+async def read_turns(
+    history_id: str,
+    response: Response,
+    after_seq: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Turns in order; pass X-Next-Cursor back as after_seq for the next page.
+    # Turns older than the history's compaction point are in its conversation text.
+    if not await get_history_async(db, history_id):
+        raise HTTPException(status_code=404, detail="History not found")
+    turns, next_seq = await list_turns_async(db, history_id, after_seq, limit)
+    if next_seq is not None:
+        response.headers["X-Next-Cursor"] = str(next_seq)
+    return turns
@@ -1,10 +1,34 @@
 # backend/app/api/notes.py
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.crud.note import create_note, delete_note, get_note, list_notes, update_note
-from app.models.schemas import NoteCreate, NoteResponse, NoteUpdate
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.database import get_async_db, get_db
+from app.core.responses import (
+    conditional_response,
+    item_etag,
+    projected_response,
+)
+from app.crud.collection_version import get_collection_etag_async
+from app.crud.note import (
+    NoteVersionConflict,
+    create_note,
+    delete_note,
+    edit_note,
+    get_note,
+    get_note_async,
+    list_notes_async,
+    list_notes_page_async,
+    update_note,
+)
+from app.crud.pagination import parse_fields
+from app.models.schemas import (
+    NoteCreate,
+    NoteEditRequest,
+    NoteEditResponse,
+    NoteResponse,
+    NoteUpdate,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/notes", tags=["notes"])
@@ -34,35 +58,73 @@ async def create_new_note(note: NoteCreate, db: Session = Depends(get_db)):
 
 @router.get("", response_model=List[NoteResponse])
 async def get_notes(
-    source_summary_id: Optional[str] = None, db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    source_summary_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all notes, optionally filtered by source/summary ID
 
     Args:
         source_summary_id: Optional ID to filter by
+        limit: Page size; if omitted all notes are returned
+        cursor: X-Next-Cursor value from the previous page
+        fields: Comma-separated response fields, e.g. "id,name,updated_at"
         db: Database session
     """
     try:
-        notes = list_notes(db, source_summary_id)
+        etag = await get_collection_etag_async(db, "notes")
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
+        selected = parse_fields(fields, NoteResponse.model_fields)
+        if limit is None:
+            notes = await list_notes_async(db, source_summary_id)
+        else:
+            notes, next_cursor = await list_notes_page_async(
+                db, limit, cursor, source_summary_id, columns=selected
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+        if selected is not None:
+            return projected_response(
+                [{key: getattr(note, key) for key in selected} for note in notes],
+                response,
+            )
         return notes
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{note_id}", response_model=NoteResponse)
-async def get_note_by_id(note_id: str, db: Session = Depends(get_db)):
+async def get_note_by_id(
+    note_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get a note by ID
+    Get a note by ID (304 if If-None-Match holds the current ETag)
 
     Args:
         note_id: ID of the note to get
         db: Database session
     """
     try:
-        note = get_note(db, note_id)
+        note = await get_note_async(db, note_id)
         if not note:
             raise HTTPException(status_code=404, detail="Note not found")
+        # Every update of a note increments its version
+        etag = item_etag("note", note.id, note.version)
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
         return note
     except HTTPException:
         raise
@@ -79,18 +141,69 @@ async def update_note_by_id(
 
     Args:
         note_id: ID of the note to update
-        note_update: Update data
+        note_update: Update data; with `version` the update is rejected with
+            409 if the note was changed in the meantime
         db: Database session
     """
     try:
         updated_note = update_note(
-            db=db, note_id=note_id, name=note_update.name, content=note_update.content
+            db=db,
+            note_id=note_id,
+            name=note_update.name,
+            content=note_update.content,
+            version=note_update.version,
         )
         if not updated_note:
             raise HTTPException(status_code=404, detail="Note not found")
         return updated_note
     except HTTPException:
         raise
+    except NoteVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/{note_id}/content", response_model=NoteEditResponse)
+async def edit_note_content(
+    note_id: str, note_edit: NoteEditRequest, db: Session = Depends(get_db)
+):
+    """
+    Apply range edits to a note's content (e.g. autosave), sending only the
+    changed text instead of the whole note
+
+    Args:
+        note_id: ID of the note to edit
+        note_edit: Version the edits are based on and the edits, each replacing
+            content[start:end] (Unicode code point offsets into that version)
+        db: Database session
+
+    Returns:
+        The new version and content length, without the content; on 409 the
+        client reloads the note and retries against the current version
+    """
+    try:
+        updated_note = edit_note(
+            db,
+            note_id,
+            note_edit.version,
+            [(edit.start, edit.end, edit.text) for edit in note_edit.edits],
+            name=note_edit.name,
+        )
+        if not updated_note:
+            raise HTTPException(status_code=404, detail="Note not found")
+        return {
+            "id": updated_note.id,
+            "version": updated_note.version,
+            "length": len(updated_note.content),
+            "updated_at": updated_note.updated_at,
+        }
+    except HTTPException:
+        raise
+    except NoteVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,31 +1,202 @@
 # backend/app/api/qa.py
-from typing import List
+import asyncio
+import json
+from typing import Dict, List, Literal, Optional, Tuple
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.logger import logger
-from app.langchain_agent.rag_agent import create_rag_chain
-from app.services.file_storage import FileStorageService
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from app.core.logger import get_logger
+from app.models.source import DBSource
+from app.services.file_storage import file_storage
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+logger = get_logger(__name__)
+
 # Initialize the router with a prefix
 router = APIRouter(prefix="/qa", tags=["qa"])
 
-# Initialize the file storage service
-file_storage = FileStorageService()
-
 
 class QARequest(BaseModel):
     question: str
     source_ids: List[str]
     llm_model: str
+    # Retrieval overrides; None falls back to the retrieval_* settings
+    top_k: Optional[int] = Field(default=None, ge=1, le=20)
+    search_type: Optional[Literal["similarity", "mmr", "adaptive"]] = None
+    score_threshold: Optional[float] = Field(default=None, ge=-1.0, le=1.0)
+    # None falls back to settings.context_compression
+    compress_context: Optional[bool] = None
+    # False returns only chunk references (fetch text via GET /qa/chunk);
+    # None falls back to settings.qa_include_contexts
+    include_contexts: Optional[bool] = None
+
+
+class ChunkRef(BaseModel):
+    source_id: str
+    # All requested sources with this content (uploads of identical files
+    # share one stored file and index), source_id first
+    source_ids: List[str] = []
+    page: Optional[int] = None  # 1-based page number in the PDF
+    # Character offsets of the chunk in the page text
+    start: Optional[int] = None
+    end: Optional[int] = None
+    score: Optional[float] = None
+
+
+class ChunkText(BaseModel):
+    source_id: str
+    page: int
+    start: int
+    end: int
+    content: str
 
 
 class QAResponse(BaseModel):
     answer: str
     references: List[str]
+    # Full chunk text, empty unless include_contexts
     contexts: List[str]
+    chunks: List[ChunkRef] = []
+
+
+class QABatchRequest(BaseModel):
+    questions: List[str] = Field(min_length=1, max_length=200)
+    source_ids: List[str]
+    llm_model: str
+    top_k: Optional[int] = Field(default=None, ge=1, le=20)
+    search_type: Optional[Literal["similarity", "mmr", "adaptive"]] = None
+    score_threshold: Optional[float] = Field(default=None, ge=-1.0, le=1.0)
+    compress_context: Optional[bool] = None
+    include_contexts: Optional[bool] = None
+    # None falls back to settings.qa_batch_concurrency
+    concurrency: Optional[int] = Field(default=None, ge=1, le=32)
+
+
+class QABatchItem(BaseModel):
+    index: int
+    question: str
+    answer: Optional[str] = None
+    references: List[str] = []
+    contexts: List[str] = []
+    chunks: List[ChunkRef] = []
+    error: Optional[str] = None
+
+
+VALID_MODELS = ["gemma3", "llama4"]
+
+
+def _resolve_paths(source_ids: List[str]) -> List[str]:
+    """
+    Resolve source IDs to stored file paths, raising 404 for missing files.
+    """
+    paths = []
+    for source_id in source_ids:
+        try:
+            file_path = file_storage.get_file_path(source_id)
+
+            # Check if the resolved file path exists
+            if not file_path.exists():
+                logger.error(f"File not found: {file_path}")
+                # We'll provide a better error message that includes the actual file path
+                raise FileNotFoundError(f"File not found at: {file_path}")
+
+            paths.append(str(file_path))
+            logger.debug("Added file path: %s", file_path)
+        except Exception as e:
+            logger.error(
+                f"Error retrieving file path for source ID {source_id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=404,
+                detail=f"File with ID {source_id} not found. Error: {str(e)}",
+            )
+    return paths
+
+
+def _compression_enabled(requested: Optional[bool]) -> bool:
+    return settings.context_compression if requested is None else requested
+
+
+def _contexts_included(requested: Optional[bool]) -> bool:
+    return settings.qa_include_contexts if requested is None else requested
+
+
+# Stored file path -> requested (source id, filename) pairs stored in that file
+SourcesByPath = Dict[str, List[Tuple[str, str]]]
+
+
+def _sources_by_path(
+    db: Session, source_ids: List[str], paths: List[str]
+) -> SourcesByPath:
+    """
+    Map each stored file back to the requested sources it holds. Sources
+    uploaded with identical content share one file, so a file can map to
+    several sources; they are listed in request order.
+    """
+    filenames = dict(
+        db.query(DBSource.id, DBSource.filename)
+        .filter(DBSource.id.in_(source_ids))
+        .all()
+    )
+    sources_by_path: SourcesByPath = {}
+    for source_id, path in zip(source_ids, paths):
+        sources = sources_by_path.setdefault(path, [])
+        if source_id not in [known_id for known_id, _ in sources]:
+            sources.append((source_id, filenames.get(source_id, source_id)))
+    return sources_by_path
+
+
+def _chunk_sources(doc, sources_by_path: SourcesByPath) -> List[Tuple[str, str]]:
+    path = (doc.metadata or {}).get("source")
+    sources = sources_by_path.get(path, [])
+    if not sources:
+        logger.warning("Context chunk from unknown file %s", path)
+    return sources
+
+
+def _chunk_refs(context, sources_by_path: SourcesByPath) -> List[ChunkRef]:
+    """
+    Describe context chunks by position instead of text: source, page,
+    offsets in the page text and retrieval score.
+    """
+    refs = []
+    for doc in context or []:
+        sources = _chunk_sources(doc, sources_by_path)
+        if not sources:
+            continue
+        metadata = doc.metadata or {}
+        page = metadata.get("page")
+        start = metadata.get("start_index")
+        has_offsets = isinstance(start, int) and start >= 0
+        refs.append(
+            ChunkRef(
+                source_id=sources[0][0],
+                source_ids=[source_id for source_id, _ in sources],
+                page=page + 1 if isinstance(page, int) else None,
+                start=start if has_offsets else None,
+                end=start + len(doc.page_content) if has_offsets else None,
+                score=metadata.get("score"),
+            )
+        )
+    return refs
+
+
+def _extract_references(context, sources_by_path: SourcesByPath) -> List[str]:
+    """
+    Build the de-duplicated list of source file names cited by the context
+    chunks (the names of the requested sources, not of the stored files).
+    """
+    references = []
+    if isinstance(context, list):
+        logger.debug("Context has %d documents", len(context))
+        for doc in context:
+            for _, filename in _chunk_sources(doc, sources_by_path):
+                if filename not in references:
+                    references.append(filename)
+    return references
 
 
 @router.post("", response_model=QAResponse)
@@ -34,7 +205,9 @@ async def ask_question(request: QARequest, db: Session = Depends(get_db)):
     Process a question using the RAG model with the specified sources.
     """
     logger.info(
-        f"Received QA request with {len(request.source_ids)} sources and model {request.llm_model}"
+        "Received QA request with %d sources and model %s",
+        len(request.source_ids),
+        request.llm_model,
     )
 
     try:
@@ -42,80 +215,63 @@ async def ask_question(request: QARequest, db: Session = Depends(get_db)):
         if not request.source_ids:
             raise HTTPException(status_code=400, detail="No source documents selected")
 
-        # Resolve file paths from source IDs
-        paths = []
-        for source_id in request.source_ids:
-            try:
-                file_path = file_storage.get_file_path(source_id)
-
-                # Check if the resolved file path exists
-                if not file_path.exists():
-                    logger.error(f"File not found: {file_path}")
-                    # We'll provide a better error message that includes the actual file path
-                    raise FileNotFoundError(f"File not found at: {file_path}")
-
-                paths.append(str(file_path))
-                logger.info(f"Added file path: {file_path}")
-            except Exception as e:
-                logger.error(
-                    f"Error retrieving file path for source ID {source_id}: {str(e)}"
-                )
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"File with ID {source_id} not found. Error: {str(e)}",
-                )
+        sources_by_path = _sources_by_path(
+            db, request.source_ids, _resolve_paths(request.source_ids)
+        )
+        paths = list(sources_by_path)
 
         # Validate the LLM model selection
-        valid_models = ["gemma3", "llama4"]
-        if request.llm_model not in valid_models:
+        if request.llm_model not in VALID_MODELS:
             request.llm_model = "gemma3"  # Default to gemma3 if not valid
 
         # Create RAG chain and run question
-        logger.info(
-            f"Creating RAG chain with model {request.llm_model} and paths: {paths}"
+        logger.debug(
+            "Creating RAG chain with model %s and %d paths", request.llm_model, len(paths)
+        )
+        compress_context = _compression_enabled(request.compress_context)
+        # Imported on first use: the RAG stack pulls in LangChain, FAISS and
+        # the model SDKs, which would otherwise slow down every startup
+        from app.langchain_agent.rag_agent import create_rag_chain
+
+        chain = create_rag_chain(
+            paths,
+            request.llm_model,
+            top_k=request.top_k,
+            search_type=request.search_type,
+            score_threshold=request.score_threshold,
+            compress_context=compress_context,
         )
-        chain = create_rag_chain(paths, request.llm_model)
-        logger.info(f"Invoking RAG chain with question: {request.question}")
+        logger.debug("Invoking RAG chain with question: %.200s", request.question)
         result = chain.invoke({"input": request.question})
-        logger.info(f"RAG chain result keys: {result.keys()}")
 
         # Extract answer and source information
         answer = result.get("answer", "No answer generated")
-        logger.info(f"Generated answer: {answer[:100]}...")  # Log first 100 chars
+        logger.debug("Generated answer: %.100s...", answer)  # Log first 100 chars
 
         # Extract context chunks for response
+        context = result.get("context")
         retrieved_contexts = []
-        if "context" in result and isinstance(result["context"], list):
-            retrieved_contexts = [doc.page_content for doc in result["context"]]
-            logger.info(f"Retrieved {len(retrieved_contexts)} context chunks.")
+        if isinstance(context, list):
+            logger.debug("Retrieved %d context chunks.", len(context))
+            if _contexts_included(request.include_contexts):
+                retrieved_contexts = [doc.page_content for doc in context]
         else:
             logger.warning("Could not find or parse 'context' in RAG chain result.")
+            context = []
 
         # Extract source references
-        references = []
-        if "context" in result and isinstance(result["context"], list):
-            logger.info(f"Context has {len(result['context'])} documents")
-            seen_sources = set()
-            for i, doc in enumerate(result["context"]):
-                # Extract metadata or create a default reference
-                if hasattr(doc, "metadata") and doc.metadata:
-                    source_name = doc.metadata.get("source", f"Source Document {i + 1}")
-                    # Attempt to get just the filename
-                    source_name = source_name.split("/")[-1].split("\\")[-1]
-                    if source_name not in seen_sources:
-                        references.append(source_name)
-                        seen_sources.add(source_name)
-                else:
-                    ref_name = f"Source Document {i + 1}"
-                    if ref_name not in seen_sources:
-                        references.append(ref_name)
-                        seen_sources.add(ref_name)
-
-        logger.info(f"Generated answer with {len(references)} unique source references")
+        references = _extract_references(context, sources_by_path)
+
+        logger.info(
+            "Generated answer with %d unique source references", len(references)
+        )
 
         # Return the extracted contexts in the response
         return QAResponse(
-            answer=answer, references=references, contexts=retrieved_contexts
+            answer=answer,
+            references=references,
+            contexts=retrieved_contexts,
+            chunks=_chunk_refs(context, sources_by_path),
         )
 
     except HTTPException:
@@ -126,3 +282,126 @@ async def ask_question(request: QARequest, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=500, detail=f"Error processing QA request: {str(e)}"
         )
+
+
+@router.post("/batch")
+async def ask_questions_batch(request: QABatchRequest, db: Session = Depends(get_db)):
+    """
+    Answer many questions against one set of sources.
+
+    The vector index is built (or loaded) once, all questions are embedded in one
+    batched pass and searched as a matrix, and generations run concurrently.
+    Results are streamed as newline-delimited JSON (one QABatchItem per line)
+    in completion order; use "index" to match them to the submitted questions.
+    """
+    logger.info(
+        "Received batch QA request with %d questions, %d sources and model %s",
+        len(request.questions),
+        len(request.source_ids),
+        request.llm_model,
+    )
+    if not request.source_ids:
+        raise HTTPException(status_code=400, detail="No source documents selected")
+
+    sources_by_path = _sources_by_path(
+        db, request.source_ids, _resolve_paths(request.source_ids)
+    )
+    paths = list(sources_by_path)
+    llm_model = request.llm_model if request.llm_model in VALID_MODELS else "gemma3"
+
+    from app.langchain_agent.index_cache import get_vectorstore
+    from app.langchain_agent.rag_agent import answer_questions_batch
+
+    # Build or load the index up front so failures still map to an HTTP error
+    try:
+        await asyncio.to_thread(get_vectorstore, paths)
+    except Exception as e:
+        logger.error(f"Error preparing index for batch QA: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error processing QA request: {str(e)}"
+        )
+
+    results = answer_questions_batch(
+        request.questions,
+        paths,
+        llm_model,
+        top_k=request.top_k,
+        search_type=request.search_type,
+        score_threshold=request.score_threshold,
+        compress_context=_compression_enabled(request.compress_context),
+        concurrency=request.concurrency or settings.qa_batch_concurrency,
+    )
+
+    include_contexts = _contexts_included(request.include_contexts)
+
+    async def _stream():
+        completed = 0
+        try:
+            async for index, result in results:
+                context = result["context"]
+                item = QABatchItem(
+                    index=index,
+                    question=request.questions[index],
+                    answer=result["answer"],
+                    references=_extract_references(context, sources_by_path),
+                    contexts=(
+                        [doc.page_content for doc in context] if include_contexts else []
+                    ),
+                    chunks=_chunk_refs(context, sources_by_path),
+                    error=result["error"],
+                )
+                completed += 1
+                yield item.model_dump_json() + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Error in batch QA processing: {str(e)}")
+            yield json.dumps({"index": None, "error": str(e)}) + "\n"
+        logger.info(
+            "Batch QA finished: %d/%d questions answered",
+            completed,
+            len(request.questions),
+        )
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/chunk", response_model=ChunkText)
+def get_chunk_text(
+    response: Response,
+    source_id: str,
+    page: int = Query(..., ge=1),
+    start: int = Query(..., ge=0),
+    end: int = Query(..., ge=1),
+):
+    """
+    Fetch the text of a chunk referenced in a QA response (ChunkRef).
+
+    A source's file never changes, so the response may be cached indefinitely.
+    Page texts are cached per file; runs in the threadpool because extracting
+    them is CPU-bound on a cache miss.
+    """
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be greater than start")
+
+    (path,) = _resolve_paths([source_id])
+    try:
+        from app.langchain_agent.tools import load_page_texts
+
+        pages = load_page_texts(path)
+    except Exception as e:
+        logger.error(f"Error loading text of source {source_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if page > len(pages):
+        raise HTTPException(status_code=404, detail=f"Page {page} not found")
+    text = pages[page - 1]
+    if end > len(text):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range {start}-{end} exceeds page length {len(text)}",
+        )
+
+    response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    return ChunkText(
+        source_id=source_id, page=page, start=start, end=end, content=text[start:end]
+    )
@@ -0,0 +1,140 @@
+# backend/app/api/search.py
+import time
+from typing import List, Literal, Optional
+
+from app.core.database import get_db
+from app.core.logger import get_logger
+from app.crud.text_search import search_text
+from app.models.schemas import (
+    SearchHit,
+    SearchResponse,
+    TextSearchHit,
+    TextSearchResponse,
+)
+from app.models.source import DBSource
+from app.services.file_storage import file_storage
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+def semantic_search(
+    q: str = Query(..., min_length=1),
+    source_ids: List[str] = Query(...),
+    limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    min_score: Optional[float] = Query(None, ge=-1.0, le=1.0),
+    db: Session = Depends(get_db),
+):
+    """
+    Rank the ingested chunks of the given sources against a query without
+    calling an LLM ("where in my slides is X discussed?").
+
+    Runs in the threadpool because embedding the query is CPU-bound. On a cached
+    index the cost is one (cached) query embedding plus one FAISS search.
+    """
+    start = time.perf_counter()
+
+    sources = db.query(DBSource).filter(DBSource.id.in_(source_ids)).all()
+    filenames = {src.id: src.filename for src in sources}
+    missing = [source_id for source_id in source_ids if source_id not in filenames]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Sources not found: {missing}")
+
+    # Chunks only know their file path; map it back to the requested source ids
+    # (deduplicated sources with the same content share one file)
+    path_to_sources = {}
+    for source_id in source_ids:
+        file_path = file_storage.get_file_path(source_id)
+        if not file_path.exists():
+            raise HTTPException(
+                status_code=404, detail=f"File with ID {source_id} not found"
+            )
+        sources_of_path = path_to_sources.setdefault(str(file_path), [])
+        if source_id not in sources_of_path:
+            sources_of_path.append(source_id)
+
+    # Imported on first use, see ask_question in app/api/qa.py
+    from app.langchain_agent.rag_agent import search_chunks
+
+    try:
+        # Fetch one extra hit to know whether another page exists
+        scored = search_chunks(
+            list(path_to_sources), q, limit + 1, offset=offset, min_score=min_score
+        )
+    except Exception as e:
+        logger.error(f"Error in semantic search: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = []
+    for doc, score in scored[:limit]:
+        hit_sources = path_to_sources.get(doc.metadata.get("source"))
+        if not hit_sources:
+            logger.warning(
+                "Dropping search hit from unknown file %s", doc.metadata.get("source")
+            )
+            continue
+        page = doc.metadata.get("page")
+        results.append(
+            SearchHit(
+                source_id=hit_sources[0],
+                source_ids=hit_sources,
+                filename=filenames[hit_sources[0]],
+                page=page + 1 if isinstance(page, int) else None,
+                score=score,
+                content=doc.page_content,
+            )
+        )
+
+    took_ms = (time.perf_counter() - start) * 1000
+    logger.debug(f"Semantic search returned {len(results)} hits in {took_ms:.1f} ms")
+    return SearchResponse(
+        query=q,
+        offset=offset,
+        limit=limit,
+        has_more=len(scored) > limit,
+        took_ms=took_ms,
+        results=results,
+    )
+
+
+@router.get("/text", response_model=TextSearchResponse)
+def full_text_search(
+    q: str = Query(..., min_length=1),
+    types: Optional[List[Literal["note", "summary", "history"]]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked keyword search over notes, summary markdown and conversation
+    histories, with highlighted snippets.
+
+    Backed by SQLite FTS5 indexes kept in sync by triggers, so a query costs an
+    index lookup instead of a scan over every stored document.
+    """
+    start = time.perf_counter()
+    try:
+        hits, has_more = search_text(db, q, types, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in full-text search: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    took_ms = (time.perf_counter() - start) * 1000
+    logger.debug(f"Full-text search returned {len(hits)} hits in {took_ms:.1f} ms")
+    return TextSearchResponse(
+        query=q,
+        offset=offset,
+        limit=limit,
+        has_more=has_more,
+        took_ms=took_ms,
+        results=[TextSearchHit(**hit) for hit in hits],
+    )
@@ -1,35 +1,99 @@
 # backend/app/api/sources.py
+import asyncio
 import os
-from typing import List
-
-import aiofiles
-from app.core.database import get_db
-from app.core.logger import logger
+from typing import List, Optional
+
+from app.core.database import get_async_db, get_db
+from app.core.logger import get_logger
+from app.core.responses import (
+    ZeroCopyFileResponse,
+    conditional_response,
+    is_not_modified,
+    item_etag,
+    not_modified_response,
+    projected_response,
+)
+from app.crud.collection_version import get_collection_etag_async
+from app.crud.pagination import parse_fields
 from app.crud.source import (
     create_source,
     delete_source,
-    get_all_sources,
+    get_all_sources_async,
     get_source,
+    get_source_async,
+    get_sources_page_async,
     rename_source,
+    resolve_filename,
 )
+from app.crud.stored_file import acquire_stored_file
 from app.models.schemas import SourceResponse, SourceUpdate
-from app.models.source import DBSource
-from app.services.file_storage import file_storage
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from app.services.file_storage import FileTooLargeError, file_storage
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/sources", tags=["sources"])
 
+# Attempts to claim a free filename when concurrent requests race for it
+FILENAME_ATTEMPTS = 10
+
+
 @router.get("", response_model=List[SourceResponse])
-async def get_sources(db: Session = Depends(get_db)):
+async def get_sources(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List sources. Without `limit` every source is returned (legacy behaviour);
+    with `limit` one page is returned newest first and the cursor for the next
+    page is sent in the X-Next-Cursor header. `fields` selects a comma-separated
+    subset of the response fields. Answers 304 if If-None-Match holds the
+    current ETag.
+    """
     try:
-        logger.info("API request: Get all sources")
-        sources = get_all_sources(db)
-        logger.debug(f"Retrieved {len(sources)} sources")
+        logger.debug("API request: Get all sources")
+        selected = parse_fields(fields, SourceResponse.model_fields)
+        etag = await get_collection_etag_async(db, "sources")
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
+        if limit is None:
+            sources = await get_all_sources_async(db)
+        else:
+            sources, next_cursor = await get_sources_page_async(
+                db, limit, cursor, selected
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+        logger.debug("Retrieved %d sources", len(sources))
+        if selected is not None:
+            return projected_response(
+                [{key: getattr(src, key) for key in selected} for src in sources],
+                response,
+            )
         return [
             {"id": src.id, "filename": src.filename, "content_type": src.content_type}
             for src in sources
         ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting sources: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,13 +101,16 @@ async def get_sources(db: Session = Depends(get_db)):
 
 @router.post("", response_model=SourceResponse)
 async def upload_source(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    tmp_path = None
     try:
-        logger.info(f"API request: Upload source file: {file.filename}")
+        logger.info("API request: Upload source file: %s", file.filename)
 
-        # Read file content
-        contents = await file.read()
+        # Oversized request bodies are already rejected by UploadLimitMiddleware
+        # while they are received; the file part itself is checked while streaming
+        # Stream file content to a temporary file (constant memory per upload)
+        tmp_path, size, digest = await file_storage.stream_to_temp(file)
+        logger.debug("Streamed %d bytes to %s (sha256=%s)", size, tmp_path, digest)
 
-        # Auto-rename logic if filename already exists in database
         original_filename = file.filename
         if original_filename is None:
             original_filename = "unnamed_file.pdf"
@@ -51,90 +118,89 @@ async def upload_source(file: UploadFile = File(...), db: Session = Depends(get_
                 "Uploaded file has no filename, using default: unnamed_file.pdf"
             )
 
-        base_name, extension = os.path.splitext(original_filename)
-        counter = 1
-        new_filename = original_filename
-
-        # Check if filename exists and rename if needed
-        existing_files = (
-            db.query(DBSource).filter(DBSource.filename == new_filename).all()
-        )
-        while existing_files:
-            new_filename = f"{base_name}({counter}){extension}"
-            logger.debug(
-                f"File with name '{original_filename}' already exists, using '{new_filename}' instead"
-            )
-            counter += 1
-            existing_files = (
-                db.query(DBSource).filter(DBSource.filename == new_filename).all()
+        # Auto-rename if the filename already exists, reference the
+        # content-addressed file (shared with identical uploads) and create the
+        # source in the same transaction. A concurrent upload
+        # may claim the same free name first; the unique index rejects it and
+        # the name is resolved again.
+        blob_path = file_storage.blob_path(digest)
+        lost_names = set()
+        for attempt in range(FILENAME_ATTEMPTS):
+            new_filename = resolve_filename(
+                db, original_filename, also_taken=lost_names
             )
-
-        # Generate source_id
-        import uuid
-
-        source_id = str(uuid.uuid4())
-        logger.debug(f"Generated source ID: {source_id}")
-
-        # Create source in database first
-        source_id = create_source(
-            db,
-            new_filename,
-            content_type=file.content_type or "application/octet-stream",
-        )
-        logger.debug(f"Created source record with ID: {source_id}")
-
-        # Now get file path - this ensures we're working with correct source ID
-        file_path = file_storage.get_file_path(source_id)
-        logger.debug(f"File will be saved to: {file_path}")
-
-        # Ensure parent directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save file content to disk
-        async with aiofiles.open(file_path, "wb") as out_file:
-            await out_file.write(contents)
-        logger.debug(f"Successfully saved file to disk: {file_path}")
-
-        # Verify file was actually saved
-        if os.path.exists(file_path):
-            logger.debug(f"Verified file exists at: {file_path}")
-        else:
-            logger.warning(f"Could not verify file exists at: {file_path}")
-            # Try to save again with absolute path
-            absolute_path = os.path.abspath(file_path)
-            logger.debug(f"Trying with absolute path: {absolute_path}")
-            os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
-            async with aiofiles.open(absolute_path, "wb") as out_file:
-                await out_file.write(contents)
-
-            if os.path.exists(absolute_path):
+            try:
+                acquire_stored_file(
+                    db,
+                    digest,
+                    str(blob_path.relative_to(file_storage.upload_dir)),
+                    size,
+                )
+                source_id = create_source(
+                    db,
+                    new_filename,
+                    content_type=file.content_type or "application/octet-stream",
+                    content_hash=digest,
+                )
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt == FILENAME_ATTEMPTS - 1:
+                    raise
+                lost_names.add(new_filename)
                 logger.debug(
-                    f"Successfully saved file to alternate location: {absolute_path}"
+                    "Filename '%s' was taken concurrently, retrying", new_filename
                 )
-            else:
-                logger.error(f"Failed to save file to either location")
+        logger.debug("Created source record with ID: %s", source_id)
+
+        # Atomically move the streamed file into place and index it
+        file_path = file_storage.commit_blob(tmp_path, digest)
+        tmp_path = None
+        file_storage.register(source_id, file_path)
+        logger.debug("Successfully saved file to disk: %s", file_path)
 
-        logger.info(f"Successfully uploaded source: {new_filename} (ID: {source_id})")
+        logger.info("Successfully uploaded source: %s (ID: %s)", new_filename, source_id)
 
         return {
             "id": source_id,
             "filename": new_filename,
             "content_type": file.content_type or "application/octet-stream",
         }
+    except FileTooLargeError as e:
+        logger.warning(f"Rejected upload {file.filename}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error uploading source: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if tmp_path is not None:
+            file_storage.discard_temp(tmp_path)
+        await file.close()
 
 @router.get("/{source_id}", response_model=SourceResponse)
-async def get_source_by_id(source_id: str, db: Session = Depends(get_db)):
+async def get_source_by_id(
+    source_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     try:
-        logger.info(f"API request: Get source by ID: {source_id}")
-        source = get_source(db, source_id)
+        logger.debug("API request: Get source by ID: %s", source_id)
+        source = await get_source_async(db, source_id)
         if not source:
             logger.warning(f"Source not found: {source_id}")
             raise HTTPException(status_code=404, detail="Source not found")
 
-        logger.debug(f"Retrieved source: {source.filename} (ID: {source_id})")
+        # Only the filename changes (rename); the content is fixed by its hash
+        etag = item_etag(
+            "source", source.id, source.filename, source.content_type, source.content_hash
+        )
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
+        logger.debug("Retrieved source: %s (ID: %s)", source.filename, source_id)
         return {
             "id": source.id,
             "filename": source.filename,
@@ -147,6 +213,55 @@ async def get_source_by_id(source_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{source_id}/file")
+async def download_source_file(
+    source_id: str, request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Serve the stored file of a source.
+
+    Supports Range / If-Range requests (so PDF viewers can fetch only the pages
+    they render), conditional requests via ETag / Last-Modified, and zero-copy
+    transfer when the ASGI server provides a sendfile extension.
+    """
+    try:
+        source = await get_source_async(db, source_id)
+        if not source:
+            logger.warning(f"Source not found: {source_id}")
+            raise HTTPException(status_code=404, detail="Source not found")
+
+        file_path = file_storage.get_file_path(source_id)
+        try:
+            stat_result = await asyncio.to_thread(os.stat, file_path)
+        except FileNotFoundError:
+            logger.error(f"File not found for source {source_id}: {file_path}")
+            raise HTTPException(status_code=404, detail="Source file not found")
+
+        headers = {"Cache-Control": "private, max-age=0, must-revalidate"}
+        if source.content_hash:
+            # Content-addressed: the hash is a strong validator
+            headers["ETag"] = f'"{source.content_hash}"'
+
+        response = ZeroCopyFileResponse(
+            file_path,
+            headers=headers,
+            media_type=source.content_type,
+            filename=source.filename,
+            stat_result=stat_result,
+            content_disposition_type="inline",
+        )
+        if is_not_modified(request.headers, response.headers):
+            return not_modified_response(response.headers)
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            f"Error serving file for source {source_id}: {str(e)}", exc_info=True
+        )
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/{source_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_source_by_id(source_id: str, db: Session = Depends(get_db)):
     try:
@@ -192,32 +307,21 @@ async def update_source(
 
         logger.debug(f"Found source to update: {source.filename} (ID: {source_id})")
 
-        # Auto-rename logic if the new filename already exists in database
-        new_filename = source_update.filename
-        base_name, extension = os.path.splitext(new_filename)
-        counter = 1
-
-        # Check if filename exists (excluding the current source) and rename if needed
-        existing_files = (
-            db.query(DBSource)
-            .filter(DBSource.filename == new_filename, DBSource.id != source_id)
-            .all()
-        )
-
-        while existing_files:
-            new_filename = f"{base_name}({counter}){extension}"
-            logger.debug(
-                f"Name '{source_update.filename}' already in use, using '{new_filename}' instead"
-            )
-            counter += 1
-            existing_files = (
-                db.query(DBSource)
-                .filter(DBSource.filename == new_filename, DBSource.id != source_id)
-                .all()
+        # Auto-rename if the new filename is used by another source (resolved
+        # again if a concurrent request claims the same name first)
+        lost_names = set()
+        for attempt in range(FILENAME_ATTEMPTS):
+            new_filename = resolve_filename(
+                db, source_update.filename, source_id, lost_names
             )
-
-        # Update the source name
-        success = rename_source(db, source_id, new_filename)
+            try:
+                success = rename_source(db, source_id, new_filename)
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt == FILENAME_ATTEMPTS - 1:
+                    raise
+                lost_names.add(new_filename)
         if not success:
             logger.error(f"Failed to update source: {source_id}")
             raise HTTPException(status_code=500, detail="Failed to update source")
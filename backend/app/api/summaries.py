@@ -1,75 +1,128 @@
-from typing import List
+from typing import List, Optional, Set
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
+from app.core.responses import (
+    conditional_response,
+    item_etag,
+    projected_response,
+)
+from app.crud.collection_version import get_collection_etag_async
+from app.crud.pagination import parse_fields
 from app.crud.summary import (
     delete_summary,
     get_summary,
-    list_named_summaries,
-    list_summaries,
+    get_summary_async,
+    list_summaries_async,
+    list_summaries_page_async,
     update_summary_name,
 )
 from app.models.schemas import SummaryResponse, SummaryUpdate
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/summaries", tags=["summaries"])
 
 
+def _summary_to_dict(summary, fields: Optional[Set[str]] = None) -> dict:
+    """
+    Convert DB model to response schema with List[str] for source_ids,
+    keeping only `fields` if given
+    """
+    data = {
+        "id": lambda: summary.id,
+        "name": lambda: summary.name,
+        "source_ids": lambda: summary.source_id_list,
+        "markdown": lambda: summary.markdown,
+        "vector_index_path": lambda: summary.vector_index_path,
+        "created_at": lambda: summary.created_at,
+    }
+    # Accessors are lazy so unloaded (projected-out) columns are never fetched
+    return {
+        key: get() for key, get in data.items() if fields is None or key in fields
+    }
+
+
 @router.get("", response_model=List[SummaryResponse])
-async def get_summaries(named_only: bool = False, db: Session = Depends(get_db)):
+async def get_summaries(
+    request: Request,
+    response: Response,
+    named_only: bool = False,
+    source_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get all summaries, optionally filtered by named only
+    Get all summaries, optionally filtered by named only or by source
 
     Args:
         named_only: If True, only return summaries with a name
+        source_id: If given, only return summaries generated from this source
+        limit: Page size; if omitted all summaries are returned
+        cursor: X-Next-Cursor value from the previous page
+        fields: Comma-separated response fields, e.g. "id,source_ids,created_at"
+            to list summaries without their markdown
         db: Database session
     """
     try:
-        if named_only:
-            summaries = list_named_summaries(db)
+        etag = await get_collection_etag_async(db, "summaries")
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
+        selected = parse_fields(fields, SummaryResponse.model_fields)
+        if limit is not None:
+            summaries, next_cursor = await list_summaries_page_async(
+                db,
+                limit,
+                cursor,
+                named_only=named_only,
+                columns=selected,
+                source_id=source_id,
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
         else:
-            summaries = list_summaries(db)
-
-        # Convert DB model to response schema with List[str] for source_ids
-        return [
-            {
-                "id": summary.id,
-                "name": summary.name,
-                "source_ids": summary.source_ids.split(",")
-                if summary.source_ids
-                else [],
-                "markdown": summary.markdown,
-                "vector_index_path": summary.vector_index_path,
-                "created_at": summary.created_at,
-            }
-            for summary in summaries
-        ]
+            summaries = await list_summaries_async(db, source_id, named_only)
+
+        if selected is not None:
+            return projected_response(
+                [_summary_to_dict(summary, selected) for summary in summaries],
+                response,
+            )
+        return [_summary_to_dict(summary) for summary in summaries]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{summary_id}", response_model=SummaryResponse)
-async def get_summary_by_id(summary_id: str, db: Session = Depends(get_db)):
+async def get_summary_by_id(
+    summary_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get a summary by ID
+    Get a summary by ID (304 if If-None-Match holds the current ETag)
 
     Args:
         summary_id: ID of the summary to get
         db: Database session
     """
     try:
-        summary = get_summary(db, summary_id)
+        summary = await get_summary_async(db, summary_id)
         if not summary:
             raise HTTPException(status_code=404, detail="Summary not found")
 
-        return {
-            "id": summary.id,
-            "name": summary.name,
-            "source_ids": summary.source_ids.split(",") if summary.source_ids else [],
-            "markdown": summary.markdown,
-            "vector_index_path": summary.vector_index_path,
-            "created_at": summary.created_at,
-        }
+        data = _summary_to_dict(summary)
+        etag = item_etag("summary", summary.id, *data.values())
+        not_modified = conditional_response(request.headers, response, etag)
+        if not_modified:
+            return not_modified
+        return data
     except HTTPException:
         raise
     except Exception as e:
@@ -93,16 +146,7 @@ async def update_summary(
         if not updated_summary:
             raise HTTPException(status_code=404, detail="Summary not found")
 
-        return {
-            "id": updated_summary.id,
-            "name": updated_summary.name,
-            "source_ids": updated_summary.source_ids.split(",")
-            if updated_summary.source_ids
-            else [],
-            "markdown": updated_summary.markdown,
-            "vector_index_path": updated_summary.vector_index_path,
-            "created_at": updated_summary.created_at,
-        }
+        return _summary_to_dict(updated_summary)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,140 @@
+# backend/app/core/compression.py
+from app.core.config import settings
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+# Compressed: JSON and text bodies. Streams (NDJSON, SSE) are left alone so every
+# chunk reaches the client immediately; files and range responses are sent as is.
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows `coding` (q=0 refuses it)"""
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        if name.strip() == coding:
+            quality = params.replace(" ", "").removeprefix("q=")
+            try:
+                return not params or float(quality) > 0
+            except ValueError:
+                return True
+    return False
+
+
+class _SelectiveResponder(IdentityResponder):
+    """
+    Compress only 200 responses with a compressible content type; pass every
+    other response, and zero-copy file messages, through unchanged.
+    """
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            await super().send_with_compression(message)
+            # Decided by the representation, so a 304 (which carries the content
+            # type of its full response) is treated like the 200
+            compressible_type = (
+                "accept-ranges" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                and not content_type.startswith(EXCLUDED_TYPES)
+            )
+            if not (compressible_type and message["status"] == 200):
+                self.content_type_is_excluded = True
+            etag = headers.get("etag")
+            if (
+                etag
+                and not etag.startswith("W/")
+                and self.content_encoding != "identity"
+                and compressible_type
+                and message["status"] in (200, 304)
+            ):
+                # A compressed body is a different byte sequence, so its validator
+                # is weak (RFC 9110 8.8.3); 304s must repeat the same tag
+                headers["etag"] = f"W/{etag}"
+        elif message_type != "http.response.body":
+            # Zero-copy file transfer extensions
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        else:
+            await super().send_with_compression(message)
+
+
+class _IdentityResponder(_SelectiveResponder):
+    content_encoding = "identity"
+
+
+class _GZipResponder(_SelectiveResponder, GZipResponder):
+    content_encoding = "gzip"
+
+
+class _BrotliResponder(_SelectiveResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if more_body:
+            return self.compressor.process(body) + self.compressor.flush()
+        return self.compressor.process(body) + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Brotli (if installed and accepted) or gzip compression of response bodies of
+    at least `minimum_size` bytes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        responder: ASGIApp
+        if brotli is not None and _accepts(accept_encoding, "br"):
+            responder = _BrotliResponder(
+                self.app, self.minimum_size, self.brotli_quality
+            )
+        elif _accepts(accept_encoding, "gzip"):
+            responder = _GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.gzip_level
+            )
+        else:
+            responder = _IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+def add_compression(app):
+    if settings.response_compression:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.gzip_level,
+            brotli_quality=settings.brotli_quality,
+        )
+    return app
@@ -1,7 +1,7 @@
 # backend/app/core/config.py
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -17,13 +17,92 @@ PROJECT_ROOT = CURRENT_DIR.parent
 class Settings(BaseSettings):
     app_name: str = "Document Processor"
     database_url: str = f"sqlite:///{CURRENT_DIR}/documents.db"
+    # Used by async routes; derived from database_url if unset (sqlite -> sqlite+aiosqlite)
+    async_database_url: Optional[str] = None
+    # Connection pool (per process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # SQLite tuning applied to every new connection
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"  # Durable in WAL mode except on power loss
+    sqlite_cache_size_kb: int = 64 * 1024
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
     # Store user uploaded files in an absolute path
     upload_dir: Path = CURRENT_DIR / "uploaded_sources"
+    # Uploads are streamed to disk in chunks of this size and rejected above max size
+    upload_chunk_size: int = 1024 * 1024
+    max_upload_size: int = 100 * 1024 * 1024
+    # Persisted FAISS vector stores; the index cache uses its "cache" subdirectory
+    vectorstore_dir: Path = CURRENT_DIR / "vectorstore"
     # 配置相关 API Key
     openai_api_key: Optional[str] = None
     openrouter_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
     deepseek_api_key: Optional[str] = None
+    # Retrieval depth: "similarity", "mmr" or "adaptive" (dynamic k up to max_k)
+    retrieval_search_type: str = "similarity"
+    retrieval_top_k: int = 3
+    retrieval_max_k: int = 8
+    retrieval_score_margin: float = 0.1
+    retrieval_score_threshold: Optional[float] = None
+    # FAISS indexes kept in memory per process (LRU)
+    index_cache_size: int = 8
+    # Persisted indexes kept on disk, shared by all workers (least recently used
+    # are pruned)
+    index_disk_cache_size: int = 32
+    # Max concurrent LLM generations per /qa/batch request
+    qa_batch_concurrency: int = 4
+    # Include full chunk text in QA responses by default (chunk references are
+    # always sent; clients can request the text with include_contexts)
+    qa_include_contexts: bool = False
+    # Extractive context compression before generation
+    context_compression: bool = False
+    compression_char_budget: int = 1200
+    # FTS5 tokenizer for full-text search; "trigram" also matches inside CJK text.
+    # Only applied when the search tables are first created.
+    fts_tokenizer: str = "unicode61 remove_diacritics 2"
+    # Conversation turns: once more than history_max_turns are stored, all but
+    # the newest history_keep_turns are folded into the conversation text
+    history_max_turns: int = 500
+    history_keep_turns: int = 200
+    # Per-stage, database and request latency histograms exported on /metrics
+    metrics_enabled: bool = True
+    # Serialize JSON responses with orjson (if installed) instead of json.dumps
+    fast_json: bool = False
+    # Brotli (if installed) / gzip compression of JSON and text responses
+    response_compression: bool = True
+    compression_minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    # Logging: records are written by a background thread. LOG_LEVELS sets
+    # per-module levels, e.g. {"app.langchain_agent": "INFO"}; LOG_DEBUG_SAMPLE_RATES
+    # keeps a fraction of DEBUG records, e.g. {"app.api.sources": 0.1}
+    log_level: str = "DEBUG"
+    log_levels: Dict[str, str] = {}
+    log_debug_sample_rates: Dict[str, float] = {}
+    # Records beyond this many pending writes are dropped instead of blocking
+    log_queue_size: int = 10000
+    # On-demand profiling: requests sending X-Profile-Token (and the admin
+    # endpoints) are only honoured when profiling_token is set. A fraction
+    # (profiling_sample_rate) of requests under profiling_paths is profiled too.
+    profiling_token: Optional[str] = None
+    profiling_sample_rate: float = 0.0
+    profiling_paths: List[str] = ["/qa", "/process"]
+    profiling_interval_ms: float = 5.0
+    profiling_max_files: int = 100
+    profile_dir: str = "profiles"
+    # Background warmup reported by /ready: load the embedding model, create
+    # the warmup_llm_model client ("" to skip) and run a tiny embedding + FAISS
+    # search (warmup_probe). With warmup disabled /ready only checks the database.
+    warmup_enabled: bool = True
+    warmup_llm_model: str = "gemma3"
+    warmup_probe: bool = True
+    # Failed database / embedding model steps are retried, doubling the delay
+    # (seconds) up to warmup_retry_max_delay
+    warmup_retry_delay: float = 1.0
+    warmup_retry_max_delay: float = 60.0
 
     class Config:
         env_file = ".env"
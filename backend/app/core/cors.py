@@ -8,5 +8,6 @@ def add_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "X-Profile-Id"],  # 分页游标、条件请求、性能分析
     )
     return app
@@ -1,11 +1,120 @@
 # backend/app/core/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply per-connection SQLite pragmas (journal_mode=WAL also persists in the file)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_db_engine(database_url: str = settings.database_url) -> Engine:
+    """
+    创建数据库 Engine。SQLite 时启用 WAL、调优 pragmas、设置 busy timeout，
+    并使用连接池复用连接（WAL 下读写互不阻塞，多个连接可以并发读）。
+    """
+    if not database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+        )
+
+    connect_args = {
+        "check_same_thread": False,
+        # Seconds the driver waits on a locked database before raising
+        "timeout": settings.sqlite_busy_timeout_ms / 1000,
+    }
+    if ":memory:" in database_url or database_url == "sqlite://":
+        # A private in-memory database only exists on a single connection
+        engine = create_engine(
+            database_url, connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(
+            database_url,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+    if settings.sqlite_tuning:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+# Async drivers for the synchronous URLs used by create_db_engine()
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    scheme, sep, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def create_async_db_engine(database_url: str = None) -> AsyncEngine:
+    """
+    创建异步 Engine（SQLite 使用 aiosqlite），与同步 Engine 使用相同的
+    pragmas 与连接池配置，供 async 路由在不阻塞事件循环的情况下查询数据库。
+    """
+    database_url = database_url or settings.async_database_url
+    if database_url is None:
+        database_url = to_async_url(settings.database_url)
+
+    if not database_url.startswith("sqlite"):
+        return create_async_engine(
+            database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+        )
+
+    connect_args = {"timeout": settings.sqlite_busy_timeout_ms / 1000}
+    if ":memory:" in database_url or database_url.endswith("://"):
+        async_engine = create_async_engine(
+            database_url, connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        # aiosqlite defaults to NullPool (a new connection and thread per checkout)
+        async_engine = create_async_engine(
+            database_url,
+            connect_args=connect_args,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+    if settings.sqlite_tuning:
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
+
+
+engine = create_db_engine()
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_db_engine()
+instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
 
 def get_db():
@@ -20,3 +129,12 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    FastAPI 依赖，生成异步数据库 Session（用于 async 路由中的只读查询）。
+    使用方法：
+      db: AsyncSession = Depends(get_async_db)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
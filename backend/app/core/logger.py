@@ -1,9 +1,14 @@
+import atexit
 import datetime
 import logging
-import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.metrics import Counter
+
 # Create logging directory if it doesn't exist
 LOG_DIR = Path("logging")
 if not LOG_DIR.exists():
@@ -13,12 +18,60 @@ if not LOG_DIR.exists():
 current_date = datetime.datetime.now().strftime("%Y-%m-%d")
 LOG_FILE = LOG_DIR / f"app_{current_date}.log"
 
+LOG_RECORDS_DROPPED = Counter(
+    "app_log_records_dropped_total", "Log records dropped because the queue was full"
+)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hand records to the background writer without blocking: the message is
+    formatted by the writer thread, and records are dropped (and counted)
+    instead of waiting when the queue is full.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: the record can be passed as is; formatting
+        # ("%s" args, tracebacks) happens in the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the DEBUG records of noisy loggers, e.g.
+    {"app.api.sources": 0.1} keeps one in ten from app.api.sources and its children.
+    """
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        # Longest prefix first, so the most specific rate wins
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + "."):
+                return random.random() < rate
+        return True
+
 
 # Configure logger
 def setup_logger():
-    """Configure the application logger."""
+    """
+    Configure the application logger. Request threads only enqueue records; a
+    QueueListener thread formats them and writes the file and console output.
+    """
     logger = logging.getLogger("app")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(settings.log_level.upper())
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
 
     # File handler for all logs (DEBUG and above)
     file_handler = RotatingFileHandler(
@@ -38,12 +91,30 @@ def setup_logger():
     console_format = logging.Formatter("%(levelname)s - %(message)s")
     console_handler.setFormatter(console_format)
 
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    log_queue = queue.Queue(maxsize=settings.log_queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if settings.log_debug_sample_rates:
+        queue_handler.addFilter(DebugSamplingFilter(settings.log_debug_sample_rates))
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    # Flush queued records on interpreter exit
+    atexit.register(listener.stop)
 
     return logger
 
 
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a module (pass __name__). Modules under the app package log
+    through the handlers of the "app" logger; their level can be set
+    individually with LOG_LEVELS.
+    """
+    return logging.getLogger(name)
+
+
 # Create the application logger
 logger = setup_logger()
@@ -0,0 +1,234 @@
+# backend/app/core/migrations.py
+from app.core.config import settings
+from app.core.logger import get_logger
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = get_logger(__name__)
+
+
+def _add_column_if_missing(conn: Connection, table: str, column: str, ddl: str):
+    """
+    Base.metadata.create_all() only creates missing tables, so columns added to
+    existing models must be added to databases created by older versions.
+    """
+    columns = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in columns:
+        logger.info(f"Migrating database: adding {table}.{column}")
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+# Full-text indexed tables: table -> (FTS table, indexed columns, result type)
+FTS_TABLES = {
+    "notes": ("notes_fts", ("name", "content"), "note"),
+    "summaries": ("summaries_fts", ("name", "markdown"), "summary"),
+    "histories": ("histories_fts", ("conversation",), "history"),
+    # Turns not yet compacted into histories.conversation
+    "history_turns": ("history_turns_fts", ("content",), "history"),
+}
+
+
+def _replace_trigger(conn: Connection, name: str, sql: str):
+    """
+    Create a trigger, replacing an existing one whose definition differs
+    (CREATE TRIGGER IF NOT EXISTS would keep triggers of older versions).
+    """
+    current = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+        {"name": name},
+    ).scalar()
+    if current == sql:
+        return
+    if current is not None:
+        logger.info(f"Migrating database: replacing trigger {name}")
+        conn.execute(text(f"DROP TRIGGER {name}"))
+    conn.execute(text(sql))
+
+
+def _create_fts_index(conn: Connection, table: str):
+    """
+    Create an external-content FTS5 index over `table`, kept in sync by triggers.
+    The index stores only tokens; text for snippets is read from `table` by rowid.
+    """
+    fts, columns, _ = FTS_TABLES[table]
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": fts},
+    ).first()
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{col}" for col in columns)
+    old_cols = ", ".join(f"old.{col}" for col in columns)
+
+    if not exists:
+        logger.info(f"Migrating database: creating full-text index {fts}")
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', "
+                f"content_rowid='rowid', tokenize='{settings.fts_tokenizer}')"
+            )
+        )
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_cols}); END"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', old.rowid, {old_cols}); END"
+        )
+    )
+    # Only updates of indexed columns re-index the row: other writes (note
+    # versions, histories.turn_count) must not tokenize the text again
+    _replace_trigger(
+        conn,
+        f"{fts}_au",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.rowid, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_cols}); END",
+    )
+
+
+# Versioned collections: collection -> tables whose writes change its responses
+COLLECTION_TABLES = {
+    "sources": ("sources",),
+    "summaries": ("summaries", "summary_sources"),
+    "notes": ("notes",),
+}
+
+
+def _create_version_triggers(conn: Connection, collection: str):
+    """
+    Count writes to a collection in collection_versions. Triggers run in the
+    writing transaction, so raw SQL and bulk writes are counted as well.
+    """
+    conn.execute(
+        text(
+            "INSERT OR IGNORE INTO collection_versions (name, version, epoch) "
+            "VALUES (:name, 0, lower(hex(randomblob(4))))"
+        ),
+        {"name": collection},
+    )
+    bump = (
+        f"UPDATE collection_versions SET version = version + 1 "
+        f"WHERE name = '{collection}'"
+    )
+    for table in COLLECTION_TABLES[collection]:
+        for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+            conn.execute(
+                text(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} "
+                    f"AFTER {event} ON {table} BEGIN {bump}; END"
+                )
+            )
+
+
+def _create_index_if_missing(conn: Connection, name: str, table: str, columns: str):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _create_filename_index(conn: Connection):
+    """
+    Unique index on sources.filename. Databases that already contain duplicate
+    names get a plain index instead so startup never fails.
+    """
+    duplicate = conn.execute(
+        text("SELECT filename FROM sources GROUP BY filename HAVING COUNT(*) > 1")
+    ).first()
+    if duplicate is None:
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_sources_filename "
+                "ON sources (filename)"
+            )
+        )
+    else:
+        logger.warning(
+            f"Duplicate source filenames (e.g. '{duplicate.filename}'); "
+            "sources.filename is indexed but not unique"
+        )
+        _create_index_if_missing(conn, "ix_sources_filename", "sources", "filename")
+
+
+def _backfill_summary_sources(conn: Connection):
+    """
+    Populate summary_sources from the legacy comma-separated summaries.source_ids
+    for summaries that have no association rows yet.
+    """
+    rows = conn.execute(
+        text(
+            "SELECT id, source_ids FROM summaries WHERE id NOT IN "
+            "(SELECT summary_id FROM summary_sources)"
+        )
+    ).fetchall()
+    links = [
+        {"summary_id": summary_id, "source_id": source_id, "position": position}
+        for summary_id, source_ids in rows
+        for position, source_id in enumerate(
+            dict.fromkeys(s for s in (source_ids or "").split(",") if s)
+        )
+    ]
+    if links:
+        logger.info(
+            f"Migrating database: linking {len(rows)} summaries to their sources"
+        )
+        conn.execute(
+            text(
+                "INSERT INTO summary_sources (summary_id, source_id, position) "
+                "VALUES (:summary_id, :source_id, :position)"
+            ),
+            links,
+        )
+
+
+def run_migrations(engine: Engine):
+    """
+    Bring an existing database up to date with the current models.
+    Every step is idempotent, so this runs on every startup after create_all().
+    """
+    with engine.begin() as conn:
+        # Content-addressed deduplication of uploads
+        _add_column_if_missing(conn, "sources", "content_hash", "VARCHAR")
+        _create_index_if_missing(
+            conn, "ix_sources_content_hash", "sources", "content_hash"
+        )
+
+        # Duplicate filename resolution
+        _create_filename_index(conn)
+
+        # Keyset pagination of list endpoints
+        for table in ("sources", "summaries", "notes", "histories"):
+            _create_index_if_missing(
+                conn, f"ix_{table}_created_at_id", table, "created_at, id"
+            )
+        _create_index_if_missing(
+            conn, "ix_notes_source_summary_id", "notes", "source_summary_id"
+        )
+
+        # Optimistic concurrency for note edits
+        _add_column_if_missing(conn, "notes", "version", "INTEGER NOT NULL DEFAULT 1")
+
+        # Append-only conversation turns
+        _add_column_if_missing(
+            conn, "histories", "turn_count", "INTEGER NOT NULL DEFAULT 0"
+        )
+        _add_column_if_missing(
+            conn, "histories", "compacted_seq", "INTEGER NOT NULL DEFAULT 0"
+        )
+
+        # Normalised summary -> source association
+        _backfill_summary_sources(conn)
+
+        # Full-text search (SQLite FTS5)
+        if conn.dialect.name == "sqlite":
+            for table in FTS_TABLES:
+                _create_fts_index(conn, table)
+
+            # Collection version counters for conditional GETs (ETag)
+            for collection in COLLECTION_TABLES:
+                _create_version_triggers(conn, collection)
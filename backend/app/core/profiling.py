@@ -0,0 +1,221 @@
+# backend/app/core/profiling.py
+import hmac
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as FrameCounter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = get_logger(__name__)
+
+PROFILE_DIR = Path(settings.profile_dir)
+ADMIN_PREFIX = "/admin/profiling"
+PROFILE_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.folded$")
+
+# Leaf frames of threads that are waiting rather than working (idle pool
+# workers, the event loop's select, the log writer)
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+
+
+class StackSampler:
+    """
+    Pure-Python sampling profiler: a daemon thread records the stack of every
+    busy thread each `interval` seconds. Samples all threads because a request
+    spans the event loop, the threadpool and asyncio.to_thread workers;
+    concurrent requests therefore show up in each other's profiles.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: FrameCounter = FrameCounter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+                    )
+                    frame = frame.f_back
+                # Rooted at the thread, so event loop and worker time separate
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks ("root;...;leaf count"), read by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingState:
+    """
+    Which requests are profiled: those sending the profiling token in the
+    X-Profile-Token header, plus a random fraction (sample_rate) of requests
+    whose path starts with one of `paths`. The admin endpoint can change the
+    rate and limit it to the next `remaining` sampled requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sample_rate = settings.profiling_sample_rate
+        self.paths = list(settings.profiling_paths)
+        self.remaining: Optional[int] = None
+
+    def configure(
+        self,
+        sample_rate: float,
+        paths: Optional[List[str]] = None,
+        remaining: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            self.sample_rate = sample_rate
+            if paths is not None:
+                self.paths = paths
+            self.remaining = remaining
+
+    def as_dict(self) -> Dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "paths": self.paths,
+            "remaining": self.remaining,
+        }
+
+    def should_sample(self, path: str) -> bool:
+        if self.sample_rate <= 0 or not path.startswith(tuple(self.paths)):
+            return False
+        if random.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            if self.remaining is None:
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+profiling_state = ProfilingState()
+
+
+def is_authorized(headers: Headers) -> bool:
+    token = headers.get(PROFILE_HEADER)
+    return bool(settings.profiling_token and token) and hmac.compare_digest(
+        token.encode(), settings.profiling_token.encode()
+    )
+
+
+def new_profile_name(method: str, path: str) -> str:
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    route = re.sub(r"[^\w]+", "_", path).strip("_")[:60] or "root"
+    return f"{stamp}-{method.lower()}-{route}-{uuid.uuid4().hex[:8]}.folded"
+
+
+def save_profile(sampler: StackSampler, name: str) -> None:
+    """Write the profile to PROFILE_DIR and prune the oldest beyond profiling_max_files"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    (PROFILE_DIR / name).write_text(sampler.folded(), encoding="utf-8")
+
+    profiles = sorted(PROFILE_DIR.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+    for old in profiles[: max(len(profiles) - settings.profiling_max_files, 0)]:
+        old.unlink(missing_ok=True)
+
+
+def list_profiles() -> List[Dict]:
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = []
+    for path in PROFILE_DIR.glob("*.folded"):
+        stat = path.stat()
+        profiles.append(
+            {
+                "name": path.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime),
+            }
+        )
+    return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    if not PROFILE_NAME.match(name):
+        return None
+    path = PROFILE_DIR / name
+    return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    Sample the stacks of profiled requests for their whole duration (including
+    streamed bodies and background tasks) and save them as collapsed stacks.
+    The profile name is returned in the X-Profile-Id header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if path.startswith(ADMIN_PREFIX) or not (
+            is_authorized(Headers(scope=scope)) or profiling_state.should_sample(path)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Named up front so it can be sent with the response headers
+        name = new_profile_name(scope["method"], path)
+        sampler = StackSampler(settings.profiling_interval_ms / 1000).start()
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = name
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            save_profile(sampler, name)
+            logger.info(
+                "Profiled %s %s: %d samples over %.2fs -> %s",
+                scope["method"],
+                path,
+                sampler.samples,
+                sampler.duration,
+                name,
+            )
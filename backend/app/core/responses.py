@@ -0,0 +1,196 @@
+# backend/app/core/responses.py
+import hashlib
+import os
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.types import Receive, Scope, Send
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+
+def json_response_class() -> type[JSONResponse]:
+    """
+    Response class for JSON bodies: ORJSONResponse if settings.fast_json is set
+    and orjson is installed, else Starlette's JSONResponse (json.dumps).
+    """
+    if not settings.fast_json:
+        return JSONResponse
+    if orjson is None:
+        logger.warning("FAST_JSON is set but orjson is not installed, using json")
+        return JSONResponse
+    return ORJSONResponse
+
+
+def is_not_modified(request_headers: Headers, response_headers: Mapping[str, str]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against a response's ETag and
+    Last-Modified headers (RFC 9110 section 13.2.2: If-None-Match wins).
+    """
+    if_none_match = request_headers.get("if-none-match")
+    etag = response_headers.get("etag")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as required for If-None-Match
+        return etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(
+                last_modified
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(
+    response_headers: Mapping[str, str], media_type: Optional[str] = None
+) -> Response:
+    """
+    304 response carrying the validator and caching headers of the full response.
+    Its content type (`media_type`, else the full response's) lets the
+    compression middleware treat the ETag as it treats the full response's.
+    """
+    return Response(
+        status_code=304,
+        headers={
+            key: response_headers[key]
+            for key in ("etag", "last-modified", "cache-control", "accept-ranges")
+            if key in response_headers
+        },
+        media_type=media_type or response_headers.get("content-type"),
+    )
+
+
+def item_etag(kind: str, item_id: str, *validators: Any) -> str:
+    """
+    ETag of a single item, derived from the values its representation is built
+    from (e.g. a version counter), so writes to other items of the collection
+    do not change it
+    """
+    digest = hashlib.sha1(repr(validators).encode("utf-8")).hexdigest()[:16]
+    return f'"{kind}-{item_id}-{digest}"'
+
+
+def conditional_response(
+    request_headers: Headers, response: Response, etag: Optional[str]
+) -> Optional[Response]:
+    """
+    Set `etag` on the injected `response` (clients must revalidate before reuse)
+    and return a 304 response if the request already holds that version.
+    Returns None when the full response has to be sent.
+    """
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if is_not_modified(request_headers, response.headers):
+        # The routes using this return JSON
+        return not_modified_response(response.headers, "application/json")
+    return None
+
+
+def projected_response(content: Any, response: Response) -> JSONResponse:
+    """
+    Serialize rows reduced by a `fields` projection. They are returned as plain
+    JSON because partial rows would not validate against the full response model.
+    Headers already set on the injected `response` are carried over.
+    """
+    return json_response_class()(
+        jsonable_encoder(content), headers=dict(response.headers)
+    )
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse (Range, If-Range, ETag and Last-Modified handling included)
+    that hands the file to the server for zero-copy transfer when the ASGI
+    server supports it:
+
+    - "http.response.zerocopysend": the server sendfile()s the byte range
+      straight from the file descriptor (full files and single ranges);
+    - "http.response.pathsend": the server streams the whole file by path.
+
+    Servers without either extension get the regular chunked read loop.
+    """
+
+    chunk_size = 256 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+
+        if ZEROCOPY_EXTENSION in self._extensions:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await self._zerocopy_send(send, 0, None)
+        elif PATHSEND_EXTENSION in self._extensions:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {"type": PATHSEND_EXTENSION, "path": os.path.abspath(self.path)}
+            )
+        else:
+            await super()._handle_simple(send, send_header_only)
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if send_header_only or ZEROCOPY_EXTENSION not in self._extensions:
+            return await super()._handle_single_range(
+                send, start, end, file_size, send_header_only
+            )
+
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send(
+            {"type": "http.response.start", "status": 206, "headers": self.raw_headers}
+        )
+        await self._zerocopy_send(send, start, end - start)
+
+    async def _zerocopy_send(self, send: Send, offset: int, count) -> None:
+        with open(self.path, "rb") as file:
+            message = {
+                "type": ZEROCOPY_EXTENSION,
+                "file": file,
+                "offset": offset,
+                "more_body": False,
+            }
+            if count is not None:
+                message["count"] = count
+            await send(message)
@@ -0,0 +1,61 @@
+# backend/app/core/upload_limit.py
+from app.core.config import settings
+from app.services.file_storage import FileTooLargeError
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Routes receiving uploads (POST)
+UPLOAD_PATHS = ("/sources",)
+# Allowance for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """
+    Enforce settings.max_upload_size on the request body of upload routes
+    before Starlette spools the multipart form: a declared Content-Length
+    over the limit is answered with 413 without reading the body, and bodies
+    without one (or with a wrong one) are cut off once the limit is exceeded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in UPLOAD_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.max_upload_size + MULTIPART_OVERHEAD
+        detail = str(FileTooLargeError(settings.max_upload_size))
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(
+                {"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside form parsing; FastAPI re-raises HTTPExceptions
+                    # from the body unchanged, so the client gets the 413
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=detail,
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,35 @@
+# backend/app/crud/collection_version.py
+from typing import Optional
+
+from app.models.collection_version import DBCollectionVersion
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def get_collection_etag_async(
+    db: AsyncSession, collection: str
+) -> Optional[str]:
+    """
+    ETag for the list responses built from a collection's current state
+    (single items use core.responses.item_etag). Any write to the collection
+    changes it. Sent weak (W/) when response compression may re-encode the body.
+
+    Read it before the data the response is built from: a write in between then
+    only makes the tag older than the data, never newer.
+
+    Args:
+        db: Database session
+        collection: Collection name ("sources", "summaries" or "notes")
+
+    Returns:
+        The ETag, or None if the database has no version counters (not SQLite)
+    """
+    result = await db.execute(
+        select(DBCollectionVersion.version, DBCollectionVersion.epoch).where(
+            DBCollectionVersion.name == collection
+        )
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return f'"{collection}-{row.epoch}-{row.version}"'
@@ -1,7 +1,16 @@
 # backend/app/crud/history.py
 import uuid
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.crud.pagination import paginate, paginate_async
 from app.models.history import DBHistory
+from app.models.history_turn import DBHistoryTurn
+
+logger = get_logger(__name__)
 
 def create_history(db: Session, conversation: str) -> DBHistory:
     history = DBHistory(
@@ -18,3 +27,134 @@ def get_history(db: Session, history_id: str) -> DBHistory:
 
 def list_histories(db: Session):
     return db.query(DBHistory).all()
+
+def list_histories_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBHistory], Optional[str]]:
+    return paginate(db.query(DBHistory), DBHistory, limit, cursor, columns)
+
+def append_turn(
+    db: Session, history_id: str, role: str, content: str
+) -> Optional[DBHistoryTurn]:
+    # Reserve the next sequence number with one atomic UPDATE, then insert the
+    # turn: the cost does not depend on the length of the conversation
+    reserved = db.execute(
+        update(DBHistory)
+        .where(DBHistory.id == history_id)
+        .values(turn_count=DBHistory.turn_count + 1)
+        .returning(DBHistory.turn_count, DBHistory.compacted_seq)
+    ).first()
+    if reserved is None:
+        db.rollback()
+        return None
+    seq, compacted_seq = reserved
+
+    turn = DBHistoryTurn(history_id=history_id, seq=seq, role=role, content=content)
+    db.add(turn)
+    db.flush()
+    db.refresh(turn)
+    # Detach with its values loaded: a compaction (this one or a concurrent
+    # one) may fold the turn away once committed
+    db.expunge(turn)
+    db.commit()
+
+    if seq - compacted_seq > settings.history_max_turns:
+        compact_turns(db, history_id)
+    return turn
+
+def compact_turns(
+    db: Session, history_id: str, keep: int = settings.history_keep_turns
+) -> int:
+    # Fold all but the newest `keep` turns into the conversation text and delete
+    # them. Runs once per (max_turns - keep_turns) appends, so the cost is amortised.
+    history = db.query(DBHistory).filter(DBHistory.id == history_id).first()
+    if history is None:
+        return 0
+    start, cutoff = history.compacted_seq, history.turn_count - keep
+    if cutoff <= start:
+        return 0
+
+    # Claim the range first; a concurrent compaction of the same history then
+    # updates no row and backs off instead of folding the turns twice
+    claimed = db.execute(
+        update(DBHistory)
+        .where(DBHistory.id == history_id, DBHistory.compacted_seq == start)
+        .values(compacted_seq=cutoff)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        return 0
+
+    in_range = (
+        DBHistoryTurn.history_id == history_id,
+        DBHistoryTurn.seq > start,
+        DBHistoryTurn.seq <= cutoff,
+    )
+    old_turns = (
+        db.query(DBHistoryTurn).filter(*in_range).order_by(DBHistoryTurn.seq).all()
+    )
+    transcript = "\n".join(f"{turn.role}: {turn.content}" for turn in old_turns)
+    db.execute(
+        update(DBHistory)
+        .where(DBHistory.id == history_id)
+        .values(
+            conversation=case(
+                (DBHistory.conversation == "", transcript),
+                else_=DBHistory.conversation + "\n" + transcript,
+            )
+        )
+    )
+    db.query(DBHistoryTurn).filter(*in_range).delete(synchronize_session=False)
+    db.commit()
+    logger.info(f"Compacted {len(old_turns)} turns of history {history_id}")
+    return len(old_turns)
+
+def _turns_page(
+    rows: List[DBHistoryTurn], limit: int
+) -> Tuple[List[DBHistoryTurn], Optional[int]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].seq
+    return rows, None
+
+def _turns_select(history_id: str, after_seq: int, limit: int):
+    # Index seek on (history_id, seq)
+    return (
+        select(DBHistoryTurn)
+        .where(DBHistoryTurn.history_id == history_id, DBHistoryTurn.seq > after_seq)
+        .order_by(DBHistoryTurn.seq)
+        .limit(limit + 1)
+    )
+
+def list_turns(
+    db: Session, history_id: str, after_seq: int = 0, limit: int = 100
+) -> Tuple[List[DBHistoryTurn], Optional[int]]:
+    rows = db.execute(_turns_select(history_id, after_seq, limit)).scalars().all()
+    return _turns_page(list(rows), limit)
+
+# Async variants for async routes (AsyncSession from get_async_db)
+
+async def get_history_async(db: AsyncSession, history_id: str) -> Optional[DBHistory]:
+    result = await db.execute(select(DBHistory).where(DBHistory.id == history_id))
+    return result.scalars().first()
+
+async def list_histories_async(db: AsyncSession) -> List[DBHistory]:
+    result = await db.execute(select(DBHistory))
+    return list(result.scalars().all())
+
+async def list_histories_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBHistory], Optional[str]]:
+    return await paginate_async(db, select(DBHistory), DBHistory, limit, cursor, columns)
+
+async def list_turns_async(
+    db: AsyncSession, history_id: str, after_seq: int = 0, limit: int = 100
+) -> Tuple[List[DBHistoryTurn], Optional[int]]:
+    result = await db.execute(_turns_select(history_id, after_seq, limit))
+    return _turns_page(list(result.scalars().all()), limit)
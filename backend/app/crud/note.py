@@ -1,9 +1,21 @@
 # backend/app/crud/note.py
 import uuid
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
 
+from app.crud.pagination import paginate, paginate_async
 from app.models.note import DBNote
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+
+class NoteVersionConflict(Exception):
+    """The note was changed since the version the client based its update on"""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Note has been modified (current version {current_version})")
+        self.current_version = current_version
 
 
 def create_note(
@@ -71,8 +83,52 @@ def list_notes(db: Session, source_summary_id: Optional[str] = None) -> List[DBN
     return db.query(DBNote).all()
 
 
+def list_notes_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    source_summary_id: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBNote], Optional[str]]:
+    """
+    List one page of notes, newest first, optionally filtered by source_summary_id
+
+    Args:
+        db: Database session
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        source_summary_id: Optional ID to filter by related source/summary
+        columns: Optional column names to load (e.g. without "content")
+
+    Returns:
+        (notes, next cursor or None on the last page)
+    """
+    query = db.query(DBNote)
+    if source_summary_id:
+        query = query.filter(DBNote.source_summary_id == source_summary_id)
+    return paginate(query, DBNote, limit, cursor, columns)
+
+
+def _commit_versioned(db: Session, note: DBNote, version: Optional[int]) -> DBNote:
+    if version is not None and note.version != version:
+        db.rollback()
+        raise NoteVersionConflict(note.version)
+    try:
+        db.commit()
+    except StaleDataError:
+        # A concurrent update committed between our read and write
+        db.rollback()
+        raise NoteVersionConflict(get_note(db, note.id).version)
+    db.refresh(note)
+    return note
+
+
 def update_note(
-    db: Session, note_id: str, name: Optional[str] = None, content: Optional[str] = None
+    db: Session,
+    note_id: str,
+    name: Optional[str] = None,
+    content: Optional[str] = None,
+    version: Optional[int] = None,
 ) -> Optional[DBNote]:
     """
     Update a note
@@ -82,9 +138,13 @@ def update_note(
         note_id: ID of the note to update
         name: Optional new name
         content: Optional new content
+        version: Optional version the update is based on
 
     Returns:
         Updated note or None if not found
+
+    Raises:
+        NoteVersionConflict: If `version` is given and the note is at another version
     """
     note = get_note(db, note_id)
     if not note:
@@ -95,9 +155,78 @@ def update_note(
     if content is not None:
         note.content = content
 
-    db.commit()
-    db.refresh(note)
-    return note
+    return _commit_versioned(db, note, version)
+
+
+def apply_text_edits(content: str, edits: Sequence[Tuple[int, int, str]]) -> str:
+    """
+    Apply range edits to `content`
+
+    Args:
+        content: Text to edit
+        edits: (start, end, text) replacements of content[start:end]; all offsets
+            refer to the original content and ranges must not overlap
+
+    Returns:
+        The edited text
+
+    Raises:
+        ValueError: If a range is out of bounds or ranges overlap
+    """
+    parts = []
+    position = 0
+    for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        if start > end or end > len(content):
+            raise ValueError(
+                f"Edit range {start}-{end} is out of bounds (length {len(content)})"
+            )
+        if start < position:
+            raise ValueError(f"Edit range {start}-{end} overlaps a previous edit")
+        parts.append(content[position:start])
+        parts.append(text)
+        position = end
+    parts.append(content[position:])
+    return "".join(parts)
+
+
+def edit_note(
+    db: Session,
+    note_id: str,
+    version: int,
+    edits: Sequence[Tuple[int, int, str]],
+    name: Optional[str] = None,
+) -> Optional[DBNote]:
+    """
+    Apply range edits to a note's content server-side, so clients only send
+    what changed
+
+    Args:
+        db: Database session
+        note_id: ID of the note to edit
+        version: Version of the note the edit offsets refer to
+        edits: (start, end, text) replacements, see apply_text_edits()
+        name: Optional new name
+
+    Returns:
+        Updated note or None if not found
+
+    Raises:
+        NoteVersionConflict: If the note is not at `version`
+        ValueError: If an edit range is invalid
+    """
+    note = get_note(db, note_id)
+    if not note:
+        return None
+    if note.version != version:
+        raise NoteVersionConflict(note.version)
+
+    content = apply_text_edits(note.content, edits)
+    if content != note.content:
+        note.content = content
+    if name is not None:
+        note.name = name
+
+    return _commit_versioned(db, note, version)
 
 
 def delete_note(db: Session, note_id: str) -> bool:
@@ -118,3 +247,42 @@ def delete_note(db: Session, note_id: str) -> bool:
     db.delete(note)
     db.commit()
     return True
+
+
+# --------------------------------------------------------------------------- #
+# Async variants for async routes (AsyncSession from get_async_db)
+# --------------------------------------------------------------------------- #
+
+
+def _notes_select(source_summary_id: Optional[str] = None):
+    stmt = select(DBNote)
+    if source_summary_id:
+        stmt = stmt.where(DBNote.source_summary_id == source_summary_id)
+    return stmt
+
+
+async def get_note_async(db: AsyncSession, note_id: str) -> Optional[DBNote]:
+    """Async variant of get_note()"""
+    result = await db.execute(select(DBNote).where(DBNote.id == note_id))
+    return result.scalars().first()
+
+
+async def list_notes_async(
+    db: AsyncSession, source_summary_id: Optional[str] = None
+) -> List[DBNote]:
+    """Async variant of list_notes()"""
+    result = await db.execute(_notes_select(source_summary_id))
+    return list(result.scalars().all())
+
+
+async def list_notes_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    source_summary_id: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBNote], Optional[str]]:
+    """Async variant of list_notes_page()"""
+    return await paginate_async(
+        db, _notes_select(source_summary_id), DBNote, limit, cursor, columns
+    )
@@ -0,0 +1,123 @@
+# backend/app/crud/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, load_only
+
+
+def encode_cursor(row) -> str:
+    """Opaque cursor pointing just past `row` in (created_at DESC, id DESC) order."""
+    payload = {
+        "id": row.id,
+        "ts": row.created_at.isoformat() if row.created_at else None,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[datetime]]:
+    """
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        ts = datetime.fromisoformat(payload["ts"]) if payload.get("ts") else None
+        return payload["id"], ts
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Iterable[str], always: Iterable[str] = ("id",)
+) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated `fields` query parameter.
+
+    Returns:
+        The selected field names (always including `always`), or None for all fields
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected | set(always)
+
+
+def _keyset(query, model, limit: int, cursor: Optional[str], columns):
+    """Apply projection, cursor condition, ordering and limit to a Query or Select."""
+    if columns is not None:
+        names = set(columns) | {"id", "created_at"}
+        query = query.options(load_only(*[getattr(model, name) for name in names]))
+
+    if cursor:
+        last_id, last_ts = decode_cursor(cursor)
+        # Compare against the stored value so formats never diverge; the
+        # timestamp in the cursor only matters if that row was deleted
+        last_created = func.coalesce(
+            select(model.created_at).where(model.id == last_id).scalar_subquery(),
+            last_ts,
+        )
+        query = query.filter(
+            or_(
+                model.created_at < last_created,
+                and_(model.created_at == last_created, model.id < last_id),
+            )
+        )
+
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def _page(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def paginate(
+    query: Query,
+    model,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List, Optional[str]]:
+    """
+    Keyset pagination, newest first, over (created_at, id).
+
+    Unlike OFFSET, each page is a single index seek on (created_at, id), so
+    page latency does not grow with the table size or page depth.
+
+    Args:
+        query: Base query (may already be filtered)
+        model: Mapped class with `id` and `created_at` columns
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        columns: Optional column names to load (id and created_at are always loaded)
+
+    Returns:
+        (rows, next cursor or None on the last page)
+    """
+    return _page(_keyset(query, model, limit, cursor, columns).all(), limit)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List, Optional[str]]:
+    """Async variant of paginate() for a select() statement."""
+    result = await db.execute(_keyset(stmt, model, limit, cursor, columns))
+    return _page(list(result.scalars().all()), limit)
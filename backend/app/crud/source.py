@@ -1,16 +1,24 @@
 # backend/app/crud/source.py
 import os
+import re
 import shutil
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
-from app.core.logger import logger
+from app.core.logger import get_logger
+from app.crud.pagination import paginate, paginate_async
+from app.crud.stored_file import get_stored_file, release_stored_file
 from app.models.source import DBSource
 from app.services.file_storage import file_storage
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+logger = get_logger(__name__)
+
 
 def get_source(db: Session, source_id: str):
-    logger.debug(f"Getting source with ID: {source_id}")
+    logger.debug("Getting source with ID: %s", source_id)
     return db.query(DBSource).filter(DBSource.id == source_id).first()
 
 
@@ -19,16 +27,118 @@ def get_all_sources(db: Session):
     return db.query(DBSource).all()
 
 
-def create_source(db: Session, filename: str, content_type: str) -> str:
+def get_sources_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBSource], Optional[str]]:
+    """
+    Get one page of sources, newest first (see crud.pagination.paginate).
+    """
+    logger.debug("Getting sources page (limit=%s, cursor=%s)", limit, cursor)
+    return paginate(db.query(DBSource), DBSource, limit, cursor, columns)
+
+
+async def get_source_async(db: AsyncSession, source_id: str):
+    logger.debug("Getting source with ID: %s", source_id)
+    result = await db.execute(select(DBSource).where(DBSource.id == source_id))
+    return result.scalars().first()
+
+
+async def get_all_sources_async(db: AsyncSession):
+    logger.debug("Getting all sources")
+    result = await db.execute(select(DBSource))
+    return list(result.scalars().all())
+
+
+async def get_sources_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[List[DBSource], Optional[str]]:
+    """
+    Async variant of get_sources_page().
+    """
+    logger.debug("Getting sources page (limit=%s, cursor=%s)", limit, cursor)
+    return await paginate_async(
+        db, select(DBSource), DBSource, limit, cursor, columns
+    )
+
+
+def resolve_filename(
+    db: Session,
+    filename: str,
+    exclude_id: Optional[str] = None,
+    also_taken: Iterable[str] = (),
+) -> str:
+    """
+    Return `filename`, or "base(n).ext" with the smallest free n if it is taken.
+
+    All existing "base", "base(…" names are fetched with one indexed range query
+    instead of probing one candidate per query.
+
+    Args:
+        db: Database session
+        filename: Requested filename
+        exclude_id: Source to ignore (the one being renamed)
+        also_taken: Names to treat as used, e.g. lost to a concurrent request
+
+    Returns:
+        A filename not used by any other source
+    """
+    base_name, extension = os.path.splitext(filename)
+    # "(" and ")" are adjacent code points, so this range is exactly the
+    # names starting with "base("
+    query = db.query(DBSource.filename).filter(
+        or_(
+            DBSource.filename == filename,
+            and_(
+                DBSource.filename >= f"{base_name}(",
+                DBSource.filename < f"{base_name})",
+            ),
+        )
+    )
+    if exclude_id is not None:
+        query = query.filter(DBSource.id != exclude_id)
+    taken = {row.filename for row in query} | set(also_taken)
+    if filename not in taken:
+        return filename
+
+    suffix = re.compile(re.escape(base_name) + r"\((\d+)\)" + re.escape(extension))
+    used = {
+        int(match.group(1))
+        for match in (suffix.fullmatch(name) for name in taken)
+        if match
+    }
+    counter = 1
+    while counter in used:
+        counter += 1
+    new_filename = f"{base_name}({counter}){extension}"
+    logger.debug(
+        "File with name '%s' already exists, using '%s' instead", filename, new_filename
+    )
+    return new_filename
+
+
+def create_source(
+    db: Session, filename: str, content_type: str, content_hash: Optional[str] = None
+) -> str:
     import uuid
 
-    logger.info(f"Creating new source: {filename}")
+    logger.info("Creating new source: %s", filename)
     source_id = str(uuid.uuid4())
-    source = DBSource(id=source_id, filename=filename, content_type=content_type)
+    source = DBSource(
+        id=source_id,
+        filename=filename,
+        content_type=content_type,
+        content_hash=content_hash,
+    )
     db.add(source)
     db.commit()
     db.refresh(source)
-    logger.debug(f"Created source with ID: {source_id}")
+    logger.debug("Created source with ID: %s", source_id)
     return source_id
 
 
@@ -45,58 +155,99 @@ def delete_source(db: Session, source_id: str) -> bool:
     """
     source = get_source(db, source_id)
     if not source:
-        logger.warning(f"Failed to delete source: source with ID {source_id} not found")
+        logger.warning(
+            "Failed to delete source: source with ID %s not found", source_id
+        )
         return False
 
     # Get the filename from the database record for logging
     stored_filename = source.filename
-    logger.info(f"Deleting source {source_id} (filename: {stored_filename})")
+    logger.info("Deleting source %s (filename: %s)", source_id, stored_filename)
 
-    # Check if file exists using the new method
-    file_exists = file_storage.file_exists(source_id)
+    if source.content_hash:
+        return _delete_deduplicated_source(db, source)
 
-    # Get file path from the service
+    # Remove the file and its index entry
     file_path = file_storage.get_file_path(source_id)
-
-    # Try to delete the file if it exists according to our check
-    if file_exists:
-        try:
-            logger.debug(f"Removing physical file: {file_path}")
-            os.remove(file_path)
-            logger.debug(f"Successfully removed file: {file_path}")
-        except (OSError, PermissionError) as e:
-            # Log the error but continue to delete the DB record
-            logger.error(f"Error deleting file {file_path}: {e}")
-    else:
-        # Try alternative locations as a fallback
-        found = False
-
-        # Try current working directory
-        cwd_path = Path.cwd() / "uploaded_sources" / f"{source_id}.pdf"
-        if cwd_path.exists():
-            try:
-                logger.warning(f"Found file in alternate location: {cwd_path}")
+    try:
+        if file_storage.delete_file(source_id):
+            logger.debug("Successfully removed file: %s", file_path)
+        else:
+            # Try alternative locations as a fallback
+            cwd_path = Path.cwd() / "uploaded_sources" / f"{source_id}.pdf"
+            if cwd_path.exists():
+                logger.warning("Found file in alternate location: %s", cwd_path)
                 os.remove(cwd_path)
                 logger.debug(
-                    f"Successfully removed file from alternate location: {cwd_path}"
+                    "Successfully removed file from alternate location: %s", cwd_path
                 )
-                found = True
-            except (OSError, PermissionError) as e:
-                logger.error(
-                    f"Error deleting file from alternate location {cwd_path}: {e}"
-                )
-
-        if not found:
-            logger.warning(f"Physical file does not exist: {file_path}")
+            else:
+                logger.warning("Physical file does not exist: %s", file_path)
+    except (OSError, PermissionError) as e:
+        # Log the error but continue to delete the DB record
+        logger.error("Error deleting file %s: %s", file_path, e)
 
     # Delete the database record
-    logger.debug(f"Removing database record for source {source_id}")
+    logger.debug("Removing database record for source %s", source_id)
     db.delete(source)
     db.commit()
-    logger.info(f"Successfully deleted source {source_id}")
+    logger.info("Successfully deleted source %s", source_id)
     return True
 
 
+def _delete_deduplicated_source(db: Session, source: DBSource) -> bool:
+    """
+    Delete a source whose content is shared through a DBStoredFile. The stored
+    file and its derived artefacts are removed only with the last reference.
+    """
+    source_id = source.id
+    content_hash = source.content_hash
+    file_path = file_storage.get_file_path(source_id)
+
+    last_reference = release_stored_file(db, content_hash)
+    db.delete(source)
+    db.commit()
+    file_storage.unregister(source_id)
+
+    if last_reference:
+        logger.info("Last reference to %s removed, deleting shared data", content_hash)
+        try:
+            file_storage.remove_blob(
+                content_hash,
+                still_referenced=lambda: get_stored_file(db, content_hash) is not None,
+            )
+        except (OSError, PermissionError) as e:
+            logger.error("Error deleting file %s: %s", file_path, e)
+
+        # Imported lazily: the vector index cache pulls in the ML stack
+        from app.langchain_agent.index_cache import evict_path
+
+        evict_path(str(file_path))
+    else:
+        logger.debug("Stored file %s is still referenced, keeping it", content_hash)
+
+    logger.info("Successfully deleted source %s", source_id)
+    return True
+
+
+def register_deduplicated_sources(db: Session) -> int:
+    """
+    Re-register shared blob locations in the file index (needed after the
+    index was rebuilt from a directory scan, which only knows file names).
+
+    Returns:
+        Number of sources registered
+    """
+    rows = (
+        db.query(DBSource.id, DBSource.content_hash)
+        .filter(DBSource.content_hash.isnot(None))
+        .all()
+    )
+    for source_id, content_hash in rows:
+        file_storage.register(source_id, file_storage.blob_path(content_hash))
+    return len(rows)
+
+
 def rename_source(db: Session, source_id: str, new_filename: str) -> bool:
     """
     Rename a source by updating its filename in the database.
@@ -112,18 +263,20 @@ def rename_source(db: Session, source_id: str, new_filename: str) -> bool:
     """
     source = get_source(db, source_id)
     if not source:
-        logger.warning(f"Failed to rename source: source with ID {source_id} not found")
+        logger.warning(
+            "Failed to rename source: source with ID %s not found", source_id
+        )
         return False
 
     # Store the old filename for logging
     old_filename = source.filename
     logger.info(
-        f"Renaming source {source_id} from '{old_filename}' to '{new_filename}'"
+        "Renaming source %s from '%s' to '%s'", source_id, old_filename, new_filename
     )
 
     # Update the filename in the database
     source.filename = new_filename
     db.commit()
     db.refresh(source)
-    logger.debug(f"Successfully renamed source {source_id}")
+    logger.debug("Successfully renamed source %s", source_id)
     return True
@@ -0,0 +1,78 @@
+# backend/app/crud/stored_file.py
+from typing import Optional
+
+from app.core.logger import get_logger
+from app.models.stored_file import DBStoredFile
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+
+def get_stored_file(db: Session, content_hash: str) -> Optional[DBStoredFile]:
+    return (
+        db.query(DBStoredFile).filter(DBStoredFile.content_hash == content_hash).first()
+    )
+
+
+def acquire_stored_file(db: Session, content_hash: str, path: str, size: int):
+    """
+    Add a reference to the stored file with the given hash, creating it if needed.
+
+    The change is flushed but not committed, so it becomes part of the caller's
+    transaction (typically together with the new DBSource row).
+
+    Args:
+        db: Database session
+        content_hash: SHA-256 of the file content
+        path: Blob path relative to the upload directory
+        size: File size in bytes
+    """
+    # Atomic increment; works even if another request just created the row
+    result = db.execute(
+        update(DBStoredFile)
+        .where(DBStoredFile.content_hash == content_hash)
+        .values(ref_count=DBStoredFile.ref_count + 1)
+    )
+    if result.rowcount:
+        logger.debug(f"Reusing stored file {content_hash}")
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(
+                DBStoredFile(
+                    content_hash=content_hash, path=path, size=size, ref_count=1
+                )
+            )
+        logger.debug(f"Created stored file {content_hash}")
+    except IntegrityError:
+        # A concurrent upload of the same content created the row first
+        db.execute(
+            update(DBStoredFile)
+            .where(DBStoredFile.content_hash == content_hash)
+            .values(ref_count=DBStoredFile.ref_count + 1)
+        )
+
+
+def release_stored_file(db: Session, content_hash: str) -> bool:
+    """
+    Drop a reference to a stored file, deleting its row with the last reference.
+    Like acquire_stored_file, the change is left for the caller to commit.
+
+    Returns:
+        True if this was the last reference and the shared data can be removed
+    """
+    db.execute(
+        update(DBStoredFile)
+        .where(DBStoredFile.content_hash == content_hash)
+        .values(ref_count=DBStoredFile.ref_count - 1)
+    )
+    remaining = db.scalar(
+        select(DBStoredFile.ref_count).where(DBStoredFile.content_hash == content_hash)
+    )
+    if remaining is None or remaining > 0:
+        return False
+    db.execute(delete(DBStoredFile).where(DBStoredFile.content_hash == content_hash))
+    return True
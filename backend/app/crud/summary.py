@@ -1,9 +1,20 @@
 # backend/app/crud/summary.py
 import uuid
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
+from app.crud.pagination import paginate, paginate_async
 from app.models.summary import DBSummary
-from sqlalchemy.orm import Session
+from app.models.summary_source import DBSummarySource
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+
+def _with_sources(query, columns: Optional[Iterable[str]] = None):
+    """Load the source links in one extra query instead of one per summary."""
+    if columns is None or "source_ids" in columns:
+        query = query.options(selectinload(DBSummary.source_links))
+    return query
 
 
 def create_summary(
@@ -33,6 +44,10 @@ def create_summary(
         markdown=markdown,
         vector_index_path=vector_index_path,
     )
+    summary.source_links = [
+        DBSummarySource(source_id=source_id, position=position)
+        for position, source_id in enumerate(dict.fromkeys(source_ids))
+    ]
     db.add(summary)
     db.commit()
     db.refresh(summary)
@@ -49,33 +64,86 @@ def get_summary(db: Session, summary_id: str) -> Optional[DBSummary]:
     Returns:
         The summary or None if not found
     """
-    return db.query(DBSummary).filter(DBSummary.id == summary_id).first()
+    return (
+        _with_sources(db.query(DBSummary)).filter(DBSummary.id == summary_id).first()
+    )
 
 
-def list_summaries(db: Session) -> List[DBSummary]:
+def _summaries_query(
+    query,
+    source_id: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+):
+    """Filter a Query or select() over DBSummary; shared by the sync and async CRUD."""
+    query = _with_sources(query, columns)
+    if source_id is not None:
+        # Index seek on summary_sources.source_id
+        query = query.join(
+            DBSummarySource, DBSummarySource.summary_id == DBSummary.id
+        ).filter(DBSummarySource.source_id == source_id)
+    return query
+
+
+def list_summaries(db: Session, source_id: Optional[str] = None) -> List[DBSummary]:
     """
     List all summaries
 
     Args:
         db: Database session
+        source_id: Optional source ID; only summaries generated from it are returned
 
     Returns:
         List of all summaries
     """
-    return db.query(DBSummary).all()
+    return _summaries_query(db.query(DBSummary), source_id).all()
 
 
-def list_named_summaries(db: Session) -> List[DBSummary]:
+def list_summaries_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    named_only: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    source_id: Optional[str] = None,
+) -> Tuple[List[DBSummary], Optional[str]]:
+    """
+    List one page of summaries, newest first
+
+    Args:
+        db: Database session
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        named_only: If True, only return summaries with a name
+        columns: Optional column names to load (e.g. without "markdown")
+        source_id: Optional source ID; only summaries generated from it are returned
+
+    Returns:
+        (summaries, next cursor or None on the last page)
+    """
+    query = _summaries_query(db.query(DBSummary), source_id, columns)
+    if named_only:
+        query = query.filter(DBSummary.name != None)
+    return paginate(query, DBSummary, limit, cursor, columns)
+
+
+def list_named_summaries(
+    db: Session, source_id: Optional[str] = None
+) -> List[DBSummary]:
     """
     List all named summaries (where name is not null)
 
     Args:
         db: Database session
+        source_id: Optional source ID; only summaries generated from it are returned
 
     Returns:
         List of named summaries
     """
-    return db.query(DBSummary).filter(DBSummary.name != None).all()
+    return (
+        _summaries_query(db.query(DBSummary), source_id)
+        .filter(DBSummary.name != None)
+        .all()
+    )
 
 
 def update_summary_name(db: Session, summary_id: str, name: str) -> Optional[DBSummary]:
@@ -118,3 +186,42 @@ def delete_summary(db: Session, summary_id: str) -> bool:
     db.delete(summary)
     db.commit()
     return True
+
+
+# --------------------------------------------------------------------------- #
+# Async variants for async routes (AsyncSession from get_async_db)
+# --------------------------------------------------------------------------- #
+
+
+async def get_summary_async(db: AsyncSession, summary_id: str) -> Optional[DBSummary]:
+    """Async variant of get_summary()"""
+    result = await db.execute(
+        _with_sources(select(DBSummary)).where(DBSummary.id == summary_id)
+    )
+    return result.scalars().first()
+
+
+async def list_summaries_async(
+    db: AsyncSession, source_id: Optional[str] = None, named_only: bool = False
+) -> List[DBSummary]:
+    """Async variant of list_summaries() / list_named_summaries()"""
+    stmt = _summaries_query(select(DBSummary), source_id)
+    if named_only:
+        stmt = stmt.where(DBSummary.name != None)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def list_summaries_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    named_only: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    source_id: Optional[str] = None,
+) -> Tuple[List[DBSummary], Optional[str]]:
+    """Async variant of list_summaries_page()"""
+    stmt = _summaries_query(select(DBSummary), source_id, columns)
+    if named_only:
+        stmt = stmt.where(DBSummary.name != None)
+    return await paginate_async(db, stmt, DBSummary, limit, cursor, columns)
@@ -0,0 +1,154 @@
+# backend/app/crud/text_search.py
+import html
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.migrations import FTS_TABLES
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Title column per table (histories have none)
+_TITLE_COLUMNS = {
+    "notes": "name",
+    "summaries": "name",
+    "histories": None,
+    "history_turns": None,
+}
+# Tables whose rows belong to a result of another table: (table, foreign key).
+# A matching turn is reported as its history.
+_PARENTS = {"history_turns": ("histories", "history_id")}
+# bm25 column weights: a match in a title counts more than one in the body
+_TITLE_WEIGHT = 4.0
+
+SNIPPET_TOKENS = 16
+# snippet() marks matches with control characters, which html.escape() leaves
+# alone; they are swapped for <mark> tags once the stored text is escaped
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word must occur,
+    and the last word also matches as a prefix (search-as-you-type).
+
+    Raises:
+        ValueError: If the query contains no searchable words
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        raise ValueError("Search query contains no searchable words")
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def highlight_snippet(snippet: str) -> str:
+    """HTML-escape a snippet, then wrap the matched terms in <mark></mark>"""
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+def _table_query(table: str) -> str:
+    fts, columns, result_type = FTS_TABLES[table]
+    title = _TITLE_COLUMNS[table]
+    weights = ", ".join(
+        str(_TITLE_WEIGHT) if column == title else "1.0" for column in columns
+    )
+    # Id and created_at come from the result row (the parent for child tables)
+    join = ""
+    result = "t"
+    if table in _PARENTS:
+        parent, foreign_key = _PARENTS[table]
+        join = f" JOIN {parent} p ON p.id = t.{foreign_key}"
+        result = "p"
+    return (
+        f"SELECT '{result_type}' AS type, {result}.id AS id, "
+        f"{'t.' + title if title else 'NULL'} AS title, "
+        f"snippet({fts}, -1, '{_MARK_START}', '{_MARK_END}', '…', {SNIPPET_TOKENS}) "
+        f"AS snippet, "
+        f"bm25({fts}, {weights}) AS rank, {result}.created_at AS created_at "
+        f"FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid{join} "
+        f"WHERE {fts} MATCH :match"
+    )
+
+
+def _type_query(result_type: str, tables: List[str]) -> str:
+    queries = [_table_query(t) for t in tables if FTS_TABLES[t][2] == result_type]
+    if len(queries) == 1:
+        return queries[0]
+    # One hit per result: a history matching in several turns (or in its
+    # conversation text) is listed once, with the snippet of its best match
+    # (SQLite takes bare columns from the row selected by MIN()). LIMIT -1 keeps
+    # SQLite from flattening the subquery, which would move bm25() and snippet()
+    # into the aggregate where FTS5 cannot evaluate them.
+    return (
+        "SELECT * FROM (SELECT type, id, title, snippet, MIN(rank) AS rank, "
+        "created_at FROM (" + " UNION ALL ".join(queries) + " LIMIT -1) GROUP BY id)"
+    )
+
+
+def search_text(
+    db: Session,
+    query: str,
+    types: Optional[Iterable[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[dict], bool]:
+    """
+    Ranked full-text search over notes, summaries and histories
+
+    Args:
+        db: Database session
+        query: Free-text query
+        types: Result types to search ("note", "summary", "history"); all if None
+        limit: Page size
+        offset: Number of hits to skip
+
+    Returns:
+        (hits with type, id, title, snippet, score and created_at, whether more hits exist)
+
+    Raises:
+        ValueError: If the query contains no searchable words
+        NotImplementedError: If the database is not SQLite
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise NotImplementedError("Full-text search requires SQLite FTS5")
+
+    tables = [
+        table
+        for table, (_, _, result_type) in FTS_TABLES.items()
+        if types is None or result_type in types
+    ]
+    if not tables:
+        return [], False
+    types_ = dict.fromkeys(FTS_TABLES[table][2] for table in tables)
+
+    sql = (
+        " UNION ALL ".join(_type_query(result_type, tables) for result_type in types_)
+        + " ORDER BY rank LIMIT :limit OFFSET :offset"
+    )
+    rows = db.execute(
+        text(sql),
+        {
+            "match": build_match_query(query),
+            "limit": limit + 1,
+            "offset": offset,
+        },
+    ).mappings()
+
+    hits = [
+        {
+            "type": row["type"],
+            "id": row["id"],
+            "title": row["title"],
+            "snippet": highlight_snippet(row["snippet"]),
+            # bm25() is lower-is-better; expose a higher-is-better score
+            "score": -row["rank"],
+            "created_at": row["created_at"],
+        }
+        for row in rows
+    ]
+    return hits[:limit], len(hits) > limit
@@ -4,6 +4,8 @@ from typing import List
 from langchain.chains import LLMChain
 from langchain.output_parsers import StrOutputParser
 from langchain.schema import Document
+from app.core.metrics import track_stage
+
 from .llm_config import get_llm
 from .prompts import SUMMARY_PROMPT, CONVERSATION_PROMPT
 from .tools import load_documents
@@ -21,7 +23,8 @@ async def process_documents(file_paths: List[str], llm_model: str) -> str:
         prompt=SUMMARY_PROMPT,
         output_parser=StrOutputParser()
     )
-    output = await chain.ainvoke({"context": content})
+    with track_stage("llm_summary", llm_model):
+        output = await chain.ainvoke({"context": content})
     return output
 
 def create_conversational_agent(memory_type: str = "buffer", llm_model: str = "gemini-flash"):
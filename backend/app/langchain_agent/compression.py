@@ -0,0 +1,105 @@
+# backend/app/langchain_agent/compression.py
+import re
+from typing import List, Tuple
+
+import numpy as np
+from app.core.logger import get_logger
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+logger = get_logger(__name__)
+
+# Split after western/CJK sentence terminators, or on blank-ish line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？;；])\s+|(?<=[。！？；])|\n+")
+
+# Sentences shorter than this carry almost no information (slide bullets, page numbers)
+MIN_SENTENCE_CHARS = 15
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    将文本块拆分为句子，过滤掉过短的片段。
+    """
+    sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(text)]
+    return [s for s in sentences if len(s) >= MIN_SENTENCE_CHARS]
+
+
+def compress_documents(
+    query: str,
+    docs: List[Document],
+    embeddings: Embeddings,
+    char_budget: int = 1200,
+) -> List[Document]:
+    """
+    抽取式上下文压缩：根据查询向量对检索到的文本块中的每个句子打分，
+    只保留得分最高的句子（总字符数不超过 char_budget），
+    并按原文顺序重新拼接为新的文本块。
+
+    参数:
+      - query: 用户问题
+      - docs: 检索器返回的文本块
+      - embeddings: 已加载的嵌入模型（复用 RAG 检索所用的 MiniLM）
+      - char_budget: 压缩后上下文的最大字符数
+
+    返回:
+      - 压缩后的文本块列表（元数据保持不变，不含任何句子的文本块会被丢弃）
+    """
+    # (doc index, position within doc, sentence)
+    candidates: List[Tuple[int, int, str]] = []
+    seen = set()
+    for doc_idx, doc in enumerate(docs):
+        for pos, sentence in enumerate(split_sentences(doc.page_content)):
+            # Overlapping chunks repeat sentences; score each one only once
+            if sentence in seen:
+                continue
+            seen.add(sentence)
+            candidates.append((doc_idx, pos, sentence))
+
+    if not candidates:
+        logger.debug("Context compression skipped: no sentences found")
+        return docs
+
+    original_chars = sum(len(doc.page_content) for doc in docs)
+    if original_chars <= char_budget:
+        return docs
+
+    # One batched forward pass for all sentences
+    query_vec = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+    sentence_vecs = np.asarray(
+        embeddings.embed_documents([c[2] for c in candidates]), dtype=np.float32
+    )
+    query_vec /= np.linalg.norm(query_vec) or 1.0
+    norms = np.linalg.norm(sentence_vecs, axis=1)
+    norms[norms == 0] = 1.0
+    scores = (sentence_vecs @ query_vec) / norms
+
+    selected = set()
+    used_chars = 0
+    for idx in np.argsort(-scores):
+        length = len(candidates[idx][2])
+        if used_chars + length > char_budget:
+            if selected:
+                continue
+            # Always keep at least the best sentence, even if it is oversized
+        selected.add(int(idx))
+        used_chars += length
+
+    kept: dict = {}
+    for idx in sorted(selected, key=lambda i: (candidates[i][0], candidates[i][1])):
+        doc_idx, _, sentence = candidates[idx]
+        kept.setdefault(doc_idx, []).append(sentence)
+
+    compressed = [
+        Document(page_content=" ".join(sentences), metadata=docs[doc_idx].metadata)
+        for doc_idx, sentences in sorted(kept.items())
+    ]
+    logger.debug(
+        "Compressed context from %d to %d chars (%d/%d sentences, %d/%d chunks)",
+        original_chars,
+        used_chars,
+        len(selected),
+        len(candidates),
+        len(compressed),
+        len(docs),
+    )
+    return compressed
@@ -0,0 +1,231 @@
+# backend/app/langchain_agent/index_cache.py
+import hashlib
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import track_stage
+from langchain_community.vectorstores import FAISS
+
+from .retrieval import cosine_relevance
+from .tools import CHUNK_METADATA_VERSION, VECTORSTORE_DIR, load_documents
+
+logger = get_logger(__name__)
+
+# Persisted indexes live in their own subdirectory, apart from the named stores
+# of tools.embed_documents; only entries written by this cache are pruned
+CACHE_DIR = VECTORSTORE_DIR / "cache"
+# Entry names are cache keys (sha1); every entry records its source files
+_KEY_PATTERN = re.compile(r"[0-9a-f]{40}")
+_PATHS_FILE = "paths.txt"
+# Entries are written and deleted under temporary names starting with "."
+_TMP_PREFIX, _TRASH_PREFIX = ".tmp-", ".trash-"
+
+_lock = threading.Lock()
+_cache: "OrderedDict[str, FAISS]" = OrderedDict()
+# One lock per cache key so concurrent requests for the same sources build once
+_build_locks: dict = {}
+# Cache key -> resolved file paths it was built from (for eviction)
+_key_paths: dict = {}
+
+
+def _resolved(paths: List[str]) -> List[str]:
+    return sorted({str(Path(path).resolve()) for path in paths})
+
+
+def _index_key(paths: List[str]) -> str:
+    """
+    根据文件路径、文件大小/修改时间、分块参数以及文本块元数据版本生成索引缓存键。
+    文件被替换或分块参数改变后键随之变化，旧索引自然失效。
+    """
+    parts: List[Tuple[str, int, int]] = []
+    for path in sorted(set(paths)):
+        stat = os.stat(path)
+        parts.append((str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns))
+    chunking = (
+        os.getenv("CHUNK_SIZE", ""),
+        os.getenv("CHUNK_OVERLAP", ""),
+        CHUNK_METADATA_VERSION,
+    )
+    return hashlib.sha1(repr((parts, chunking)).encode("utf-8")).hexdigest()
+
+
+def _persisted_entries() -> List[Path]:
+    """本缓存写入的持久化索引目录（不包括命名向量存储和临时目录）"""
+    if not CACHE_DIR.exists():
+        return []
+    return [
+        d
+        for d in CACHE_DIR.iterdir()
+        if _KEY_PATTERN.fullmatch(d.name) and (d / _PATHS_FILE).exists()
+    ]
+
+
+def _discard(index_dir: Path):
+    """
+    先把目录原子地重命名到一旁再删除：其他线程或进程不会加载到删除了一半的索引，
+    正在加载的请求最多加载失败并重新构建。
+    """
+    trash = index_dir.with_name(f"{_TRASH_PREFIX}{index_dir.name}-{uuid.uuid4().hex}")
+    try:
+        os.rename(index_dir, trash)
+    except OSError:
+        return  # Already removed (or being removed) by someone else
+    shutil.rmtree(trash, ignore_errors=True)
+    logger.info("Removed persisted vector index: %s", index_dir.name)
+
+
+def _prune_persisted():
+    """
+    只保留最近使用的 index_disk_cache_size 个持久化索引（按目录修改时间，
+    所有工作进程共享），并清理中断删除时遗留的目录。
+    """
+    entries = []
+    for d in _persisted_entries():
+        try:
+            entries.append((d.stat().st_mtime, d))
+        except OSError:
+            continue
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    for _, d in entries[settings.index_disk_cache_size :]:
+        _discard(d)
+    for d in CACHE_DIR.glob(f"{_TRASH_PREFIX}*"):
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def _touch(index_dir: Path):
+    # Mark as recently used for _prune_persisted
+    try:
+        os.utime(index_dir)
+    except OSError:
+        pass
+
+
+def _load_persisted(index_dir: Path):
+    """加载持久化索引；索引不存在或在加载期间被删除时返回 None"""
+    # Imported here to avoid a circular import with rag_agent
+    from .rag_agent import get_embeddings
+
+    if not (index_dir / "index.faiss").exists():
+        return None
+    logger.info("Loading persisted vector index: %s", index_dir)
+    try:
+        with track_stage("index_load"):
+            vectorstore = FAISS.load_local(
+                str(index_dir),
+                get_embeddings(),
+                allow_dangerous_deserialization=True,  # written by this service
+                relevance_score_fn=cosine_relevance,
+            )
+    except (OSError, RuntimeError) as e:
+        # Pruned or evicted by another worker while loading: rebuild instead
+        logger.warning("Could not load persisted vector index %s: %s", index_dir, e)
+        return None
+    _touch(index_dir)
+    return vectorstore
+
+
+def _persist(key: str, vectorstore: FAISS, paths: List[str]):
+    """
+    先写入临时目录再原子地重命名，其他进程只会看到完整的索引；
+    若另一进程已写入同一键，则保留已有的索引。
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_dir = CACHE_DIR / f"{_TMP_PREFIX}{key}-{uuid.uuid4().hex}"
+    try:
+        vectorstore.save_local(str(tmp_dir))
+        (tmp_dir / _PATHS_FILE).write_text(
+            "\n".join(_resolved(paths)), encoding="utf-8"
+        )
+        os.rename(tmp_dir, CACHE_DIR / key)
+    except OSError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if (CACHE_DIR / key / _PATHS_FILE).exists():
+            logger.debug("Vector index %s was persisted by another worker", key)
+        else:
+            logger.warning("Could not persist vector index %s: %s", key, e)
+        return
+    _prune_persisted()
+
+
+def get_vectorstore(paths: List[str]) -> FAISS:
+    """
+    返回给定 PDF 集合的 FAISS 向量存储：
+    1. 优先使用进程内 LRU 缓存；
+    2. 其次从 CACHE_DIR 加载之前持久化的索引；
+    3. 否则加载、拆分文档并构建索引，然后持久化。
+    内存缓存按进程淘汰；磁盘上的索引按所有进程共享的最近使用时间单独清理。
+    """
+    # Imported here to avoid a circular import with rag_agent
+    from .rag_agent import create_vectorstore_from_docs
+
+    key = _index_key(paths)
+    index_dir = CACHE_DIR / key
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            logger.debug("Vector index cache hit: %s", key)
+            vectorstore = _cache[key]
+        else:
+            vectorstore = None
+            build_lock = _build_locks.setdefault(key, threading.Lock())
+    if vectorstore is not None:
+        _touch(index_dir)
+        return vectorstore
+
+    try:
+        with build_lock:
+            with _lock:
+                if key in _cache:
+                    return _cache[key]
+
+            vectorstore = _load_persisted(index_dir)
+            if vectorstore is None:
+                docs = load_documents(paths)
+                if not docs:
+                    raise ValueError(
+                        "No documents were loaded. Please check the file paths or file formats."
+                    )
+                logger.info("Building vector index for %d files: %s", len(paths), key)
+                vectorstore = create_vectorstore_from_docs(docs)
+                _persist(key, vectorstore, paths)
+
+            with _lock:
+                _cache[key] = vectorstore
+                _key_paths[key] = set(_resolved(paths))
+                while len(_cache) > settings.index_cache_size:
+                    evicted_key, _ = _cache.popitem(last=False)
+                    _key_paths.pop(evicted_key, None)
+                    logger.debug("Evicted vector index from cache: %s", evicted_key)
+    finally:
+        # Also on failure, so a failed build does not leave its lock behind
+        with _lock:
+            _build_locks.pop(key, None)
+    return vectorstore
+
+
+def evict_path(path: str):
+    """
+    删除所有包含该文件的向量索引（内存缓存与持久化副本），
+    在文件的最后一个引用被删除时调用。
+    """
+    resolved = str(Path(path).resolve())
+    with _lock:
+        for key in [k for k, paths in _key_paths.items() if resolved in paths]:
+            _cache.pop(key, None)
+            _key_paths.pop(key, None)
+
+    for index_dir in _persisted_entries():
+        try:
+            indexed = (index_dir / _PATHS_FILE).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        if resolved in indexed.splitlines():
+            _discard(index_dir)
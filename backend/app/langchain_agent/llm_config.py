@@ -2,13 +2,12 @@
 import os
 
 from app.core.config import settings
-from app.core.logger import logger
-from google.generativeai.types import HarmBlockThreshold, HarmCategory
-from langchain_community.llms import HuggingFaceTextGenInference
+from app.core.logger import get_logger
 from langchain_core.language_models import BaseChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import SecretStr
 
+logger = get_logger(__name__)
+
 
 def get_llm(model_name: str = "gemma3") -> BaseChatModel:
     """
@@ -27,6 +26,8 @@ def get_llm(model_name: str = "gemma3") -> BaseChatModel:
             # This is a placeholder for LLaMA 4 integration
             # In a real implementation, you would configure the actual endpoint
             logger.info("Using Llama 4 model")
+            from langchain_community.llms import HuggingFaceTextGenInference
+
             return HuggingFaceTextGenInference(
                 inference_server_url="http://localhost:8080/",
                 max_new_tokens=512,
@@ -58,6 +59,10 @@ def get_gemini_model() -> BaseChatModel:
       - 一个 BaseChatModel 实例。
     """
     logger.info("Using Gemma 3-27B model")
+    # 模型 SDK 仅在首次创建模型时导入，避免拖慢服务启动
+    from google.generativeai.types import HarmBlockThreshold, HarmCategory
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     gemini_api_key = settings.gemini_api_key
     if not gemini_api_key:
         logger.warning("GEMINI_API_KEY not found in settings")
@@ -1,20 +1,31 @@
 # backend/app/langchain_agent/rag_agent.py
-from typing import Any, Dict, List
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # Updated imports for new LangChain structure
-from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 
 # Update imports to use langchain_core instead of langchain when possible
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import observe_stage, track_stage
+
+from .compression import compress_documents
+from .index_cache import get_vectorstore
 from .llm_config import get_llm
 from .prompts import CONVERSATION_PROMPT
+from .retrieval import AdaptiveRetriever, cosine_relevance
 from .tools import load_documents
 
+logger = get_logger(__name__)
+
 
 def load_documents_for_rag(paths: List[str]) -> List[Document]:
     """
@@ -25,47 +36,233 @@ def load_documents_for_rag(paths: List[str]) -> List[Document]:
     return docs
 
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> Embeddings:
+    """
+    返回进程内共享的 MiniLM 嵌入模型实例，避免每次请求重复加载模型。
+    langchain_huggingface 会导入 sentence-transformers/torch，因此在首次使用时才导入。
+    """
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+
+@lru_cache(maxsize=1024)
+def _embed_query_cached(query: str) -> Tuple[float, ...]:
+    with track_stage("embed_query", EMBEDDING_MODEL):
+        return tuple(get_embeddings().embed_query(query))
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    with track_stage("embed_batch", EMBEDDING_MODEL):
+        return get_embeddings().embed_documents(texts)
+
+
+def _llm_run_listener(llm_model: str, failed: bool = False):
+    """
+    返回记录 LLM 生成耗时的回调（Runnable.with_listeners），同步与异步调用均适用。
+    """
+
+    def listener(run):
+        if run.start_time and run.end_time:
+            seconds = (run.end_time - run.start_time).total_seconds()
+            observe_stage("llm", seconds, llm_model, failed)
+
+    return listener
+
+
+def embed_query(query: str) -> List[float]:
+    """
+    计算查询向量，重复查询（翻页、重复搜索）直接命中进程内缓存。
+    """
+    return list(_embed_query_cached(query))
+
+
+def search_chunks(
+    paths: List[str],
+    query: str,
+    limit: int,
+    offset: int = 0,
+    min_score: Optional[float] = None,
+) -> List[Tuple[Document, float]]:
+    """
+    不调用 LLM，仅通过检索层返回与查询最相关的文本块（按相似度降序），
+    支持 offset/limit 分页。
+    """
+    vectorstore = get_vectorstore(paths)
+    retriever = create_retriever(
+        vectorstore,
+        top_k=offset + limit,
+        search_type="similarity",
+        score_threshold=min_score,
+    )
+    return retriever.search_by_vector(embed_query(query))[offset:]
+
+
 def create_vectorstore_from_docs(docs: List[Document]) -> FAISS:
     """
     根据文档列表计算嵌入向量，并利用 FAISS 构建向量存储。
     """
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    vectorstore = FAISS.from_documents(docs, embeddings)
+    embeddings = get_embeddings()
+    # Embeds every chunk and builds the FAISS index
+    with track_stage("index_build", EMBEDDING_MODEL):
+        vectorstore = FAISS.from_documents(
+            docs, embeddings, relevance_score_fn=cosine_relevance
+        )
     return vectorstore
 
 
-def create_rag_chain(paths: List[str], llm_model: str, top_k: int = 3):
+def create_retriever(
+    vectorstore: FAISS,
+    top_k: Optional[int] = None,
+    search_type: Optional[str] = None,
+    score_threshold: Optional[float] = None,
+) -> AdaptiveRetriever:
     """
-    构建 Retrieval-Augmented Generation（RAG）问答链：
-    1. 加载 PDF 并拆分为文本块；
-    2. 根据文本块计算嵌入并构建 FAISS 向量存储；
-    3. 配置检索器，返回与查询最相关的 top_k 个文本块；
-    4. 利用 LLM 生成答案（"stuff" 模式）。
+    配置检索器（similarity / mmr / adaptive，可选相似度阈值；
+    未指定的参数使用 settings 中的默认值，adaptive 模式下 top_k 作为动态 k 的上限）。
     """
-    # 加载文档
-    docs = load_documents_for_rag(paths)
+    return AdaptiveRetriever(
+        vectorstore=vectorstore,
+        search_type=search_type or settings.retrieval_search_type,
+        k=top_k or settings.retrieval_top_k,
+        max_k=top_k or settings.retrieval_max_k,
+        score_threshold=(
+            score_threshold
+            if score_threshold is not None
+            else settings.retrieval_score_threshold
+        ),
+        score_margin=settings.retrieval_score_margin,
+    )
+
 
-    # Check if docs is empty
-    if not docs or len(docs) == 0:
-        raise ValueError(
-            "No documents were loaded. Please check the file paths or file formats."
+def create_answer_chain(
+    llm_model: str,
+    compress_context: bool = False,
+    compression_char_budget: int = settings.compression_char_budget,
+):
+    """
+    构建生成答案的链（"stuff" 模式），输入为 {"input": 问题, "context": 文本块}。
+    compress_context 为 True 时先对文本块做抽取式压缩，只把最相关的句子交给 LLM。
+    """
+    llm = get_llm(llm_model)
+    combine_docs_chain = create_stuff_documents_chain(
+        llm, CONVERSATION_PROMPT
+    ).with_listeners(
+        on_end=_llm_run_listener(llm_model),
+        on_error=_llm_run_listener(llm_model, failed=True),
+    )
+    if compress_context:
+        embeddings = get_embeddings()
+
+        def compress(x):
+            with track_stage("compress", EMBEDDING_MODEL):
+                return compress_documents(
+                    x["input"], x["context"], embeddings, compression_char_budget
+                )
+
+        compress = RunnableLambda(compress)
+        combine_docs_chain = (
+            RunnablePassthrough.assign(context=compress) | combine_docs_chain
         )
+    return combine_docs_chain
 
-    # 构建向量存储
-    vectorstore = create_vectorstore_from_docs(docs)
 
-    # 获取 LLM
-    llm = get_llm(llm_model)
+def create_rag_chain(
+    paths: List[str],
+    llm_model: str,
+    top_k: Optional[int] = None,
+    search_type: Optional[str] = None,
+    score_threshold: Optional[float] = None,
+    compress_context: bool = False,
+    compression_char_budget: int = settings.compression_char_budget,
+):
+    """
+    构建 Retrieval-Augmented Generation（RAG）问答链：
+    1. 加载（或从缓存获取）PDF 文本块的 FAISS 向量存储；
+    2. 配置检索器，返回与查询最相关的文本块；
+    3. （可选）对文本块做抽取式压缩；
+    4. 利用 LLM 生成答案（"stuff" 模式）。
 
-    # 配置检索器
-    retriever = vectorstore.as_retriever(search_kwargs={"k": top_k})
+    返回结果中的 "context" 始终是未压缩的完整文本块。
+    """
+    # 构建或加载向量存储
+    vectorstore = get_vectorstore(paths)
+
+    retriever = create_retriever(vectorstore, top_k, search_type, score_threshold)
+    combine_docs_chain = create_answer_chain(
+        llm_model, compress_context, compression_char_budget
+    )
 
-    # 使用新的 create_retrieval_chain 方法构建 RAG 链
-    combine_docs_chain = create_stuff_documents_chain(llm, CONVERSATION_PROMPT)
-    qa_chain = create_retrieval_chain(retriever, combine_docs_chain)
+    # 与 create_retrieval_chain 等价，但允许在生成前替换 context
+    retrieval_docs = (lambda x: x["input"]) | retriever
+    qa_chain = (
+        RunnablePassthrough.assign(
+            context=retrieval_docs.with_config(run_name="retrieve_documents"),
+        ).assign(answer=combine_docs_chain)
+    ).with_config(run_name="retrieval_chain")
 
     return qa_chain
 
+
+async def answer_questions_batch(
+    questions: List[str],
+    paths: List[str],
+    llm_model: str,
+    top_k: Optional[int] = None,
+    search_type: Optional[str] = None,
+    score_threshold: Optional[float] = None,
+    compress_context: bool = False,
+    concurrency: int = settings.qa_batch_concurrency,
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    针对同一组文档批量回答多个问题：
+    1. 索引只构建（或加载）一次；
+    2. 所有问题在一次批量前向计算中完成嵌入，并以矩阵形式检索；
+    3. 在并发上限内并行生成答案，每完成一个即产出 (问题序号, 结果)。
+
+    结果字典包含 "context"（文本块列表）、"answer" 和 "error"。
+    """
+    vectorstore = await asyncio.to_thread(get_vectorstore, paths)
+    retriever = create_retriever(vectorstore, top_k, search_type, score_threshold)
+
+    query_vectors = await asyncio.to_thread(_embed_batch, questions)
+    retrieved = await asyncio.to_thread(retriever.batch_search_by_vector, query_vectors)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Batch retrieval for %d questions: depths=%s",
+            len(questions),
+            [len(scored) for scored in retrieved],
+        )
+
+    answer_chain = create_answer_chain(llm_model, compress_context)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _answer(index: int) -> Tuple[int, Dict[str, Any]]:
+        context = [doc for doc, _ in retrieved[index]]
+        async with semaphore:
+            try:
+                answer = await answer_chain.ainvoke(
+                    {"input": questions[index], "context": context}
+                )
+                return index, {"context": context, "answer": answer, "error": None}
+            except Exception as e:
+                logger.error(f"Batch question {index} failed: {str(e)}")
+                return index, {"context": context, "answer": None, "error": str(e)}
+
+    tasks = [asyncio.create_task(_answer(i)) for i in range(len(questions))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client disconnected mid-stream: stop outstanding generations
+        for task in tasks:
+            task.cancel()
+
+
 if __name__ == "__main__":
     file_paths = ["uploaded_sources/sample.pdf"]  # 确保该文件存在
     rag_chain = create_rag_chain(file_paths, "gemma3")
@@ -0,0 +1,167 @@
+# backend/app/langchain_agent/retrieval.py
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+from app.core.logger import get_logger
+from app.core.metrics import track_stage
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+logger = get_logger(__name__)
+
+SEARCH_TYPES = ("similarity", "mmr", "adaptive")
+
+
+def cosine_relevance(distance: float) -> float:
+    """
+    将 FAISS（IndexFlatL2）返回的平方欧氏距离转换为余弦相似度。
+    MiniLM 输出单位向量，因此 cos = 1 - d² / 2。
+    """
+    return 1.0 - distance / 2.0
+
+
+def select_dynamic_k(
+    scored: List[Tuple[Document, float]], min_k: int, max_k: int, score_margin: float
+) -> int:
+    """
+    根据得分分布动态决定保留的文本块数量：
+    保留与最高分相差不超过 score_margin 的文本块，结果限制在 [min_k, max_k]。
+    问题只涉及单一段落时得分会迅速下降（k 较小），
+    跨文档问题的得分更平坦（k 较大）。
+    """
+    if not scored:
+        return 0
+    top_score = scored[0][1]
+    k = sum(1 for _, score in scored if top_score - score <= score_margin)
+    return max(min(k, max_k, len(scored)), min(min_k, len(scored)))
+
+
+class AdaptiveRetriever(BaseRetriever):
+    """
+    基于 FAISS 的检索器，支持相似度阈值、MMR 以及根据得分分布动态调整 k。
+    每个返回的文本块的 metadata["score"] 中记录其余弦相似度。
+    """
+
+    vectorstore: FAISS
+    search_type: str = "similarity"
+    k: int = 3
+    score_threshold: Optional[float] = None
+    # Only used by "adaptive"
+    min_k: int = 1
+    max_k: int = 8
+    score_margin: float = 0.1
+    # Only used by "mmr"
+    fetch_k: int = 20
+    lambda_mult: float = 0.5
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def search(self, query: str) -> List[Tuple[Document, float]]:
+        """
+        执行检索并返回 (文本块, 相似度) 列表，按相似度降序排列（MMR 按多样性顺序）。
+        """
+        embedding = self.vectorstore.embeddings.embed_query(query)
+        return self.search_by_vector(embedding)
+
+    def search_by_vector(self, embedding: List[float]) -> List[Tuple[Document, float]]:
+        with track_stage("retrieval"):
+            if self.search_type == "mmr":
+                results = (
+                    self.vectorstore.max_marginal_relevance_search_with_score_by_vector(
+                        embedding,
+                        k=self.k,
+                        fetch_k=max(self.fetch_k, self.k),
+                        lambda_mult=self.lambda_mult,
+                    )
+                )
+            else:
+                results = self.vectorstore.similarity_search_with_score_by_vector(
+                    embedding, k=self._search_depth()
+                )
+        return self._postprocess(results)
+
+    def batch_search_by_vector(
+        self, embeddings: List[List[float]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        对多个查询向量执行检索。similarity / adaptive 模式下
+        以矩阵形式一次性调用 FAISS 搜索；MMR 需要逐个查询计算多样性。
+        """
+        if not embeddings:
+            return []
+        if self.search_type == "mmr":
+            return [self.search_by_vector(embedding) for embedding in embeddings]
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if self.vectorstore._normalize_L2:
+            faiss.normalize_L2(vectors)
+        with track_stage("retrieval_batch"):
+            distances, indices = self.vectorstore.index.search(
+                vectors, self._search_depth()
+            )
+
+        batch = []
+        for row_distances, row_indices in zip(distances, indices):
+            results = [
+                (
+                    self.vectorstore.docstore.search(
+                        self.vectorstore.index_to_docstore_id[i]
+                    ),
+                    float(distance),
+                )
+                for distance, i in zip(row_distances, row_indices)
+                if i != -1  # fewer chunks in the index than requested
+            ]
+            batch.append(self._postprocess(results))
+        return batch
+
+    def _search_depth(self) -> int:
+        return self.max_k if self.search_type == "adaptive" else self.k
+
+    def _postprocess(
+        self, results: List[Tuple[Document, float]]
+    ) -> List[Tuple[Document, float]]:
+        """
+        将 FAISS 距离转换为相似度，并应用阈值与动态 k。
+        """
+        relevance = self.vectorstore._select_relevance_score_fn()
+        scored = [(doc, float(relevance(distance))) for doc, distance in results]
+
+        if self.score_threshold is not None:
+            scored = [(doc, s) for doc, s in scored if s >= self.score_threshold]
+
+        if self.search_type == "adaptive":
+            scored = scored[
+                : select_dynamic_k(scored, self.min_k, self.max_k, self.score_margin)
+            ]
+
+        # Copy documents so the score does not leak into the shared docstore
+        return [
+            (
+                Document(
+                    page_content=doc.page_content, metadata={**doc.metadata, "score": s}
+                ),
+                s,
+            )
+            for doc, s in scored
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        scored = self.search(query)
+        logger.debug(
+            "Retrieval depth: %d chunks (search_type=%s, k=%d, max_k=%d, "
+            "score_threshold=%s, top_score=%s)",
+            len(scored),
+            self.search_type,
+            self.k,
+            self.max_k,
+            self.score_threshold,
+            round(scored[0][1], 3) if scored else None,
+        )
+        return [doc for doc, _ in scored]
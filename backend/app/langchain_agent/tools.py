@@ -1,21 +1,28 @@
 # backend/app/langchain_agent/tools.py
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Tuple
 
 from app.core.config import settings
-from app.core.logger import logger
+from app.core.logger import get_logger
+from app.core.metrics import track_stage
 from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pydantic import SecretStr
 
-# 设置向量数据库的本地保存目录
-VECTORSTORE_DIR = Path("vectorstore")
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+logger = get_logger(__name__)
+
+# 向量数据库的本地保存目录（由配置决定，不依赖当前工作目录）
+VECTORSTORE_DIR = settings.vectorstore_dir
+# 文本块元数据格式版本（计入索引缓存键；变更后旧索引会被重建）
+# 2: metadata["start_index"] 记录文本块在所在页文本中的起始偏移
+CHUNK_METADATA_VERSION = 2
 
 
 def load_documents(pdf_paths: List[str]) -> List[Document]:
@@ -49,16 +56,17 @@ def load_and_split_pdfs(pdf_paths: List[str]) -> List[Document]:
                 logger.error(f"Path object verification failed: {path_obj}")
                 continue
 
-            logger.info(f"Attempting to load PDF from: {path_obj.absolute()}")
+            logger.debug("Attempting to load PDF from: %s", path_obj)
             loader = PyPDFLoader(str(path_obj.absolute()))
-            raw_docs = loader.load()
+            with track_stage("load_pdf"):
+                raw_docs = loader.load()
             # Add metadata enrichment
             for doc in raw_docs:
                 if not hasattr(doc, "metadata") or not doc.metadata:
                     doc.metadata = {}
                 doc.metadata["source"] = path  # Add source path to metadata
             documents.extend(raw_docs)
-            logger.debug(f"Loaded {len(raw_docs)} pages from {path}")
+            logger.debug("Loaded %d pages from %s", len(raw_docs), path)
         except Exception as e:
             logger.error(f"Failed to load PDF {path}: {e}")
             # Decide whether to skip or raise
@@ -96,7 +104,7 @@ def load_and_split_pdfs(pdf_paths: List[str]) -> List[Document]:
         chunk_size = default_chunk_size
         chunk_overlap = default_chunk_overlap
 
-    logger.info(f"Using chunk_size={chunk_size}, chunk_overlap={chunk_overlap}")
+    logger.debug("Using chunk_size=%d, chunk_overlap=%d", chunk_size, chunk_overlap)
 
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
@@ -104,16 +112,36 @@ def load_and_split_pdfs(pdf_paths: List[str]) -> List[Document]:
         # Consider adding separators relevant to your documents if needed
         # separators=["\n\n", "\n", ". ", " ", ""]
         length_function=len,  # Default, measures in characters
+        # Chunk offsets in the page text, so responses can reference chunks
+        # instead of carrying their text (see load_page_texts)
+        add_start_index=True,
     )
 
-    split_docs = splitter.split_documents(documents)
-    logger.info(f"Split {len(documents)} pages into {len(split_docs)} chunks.")
+    with track_stage("split"):
+        split_docs = splitter.split_documents(documents)
+    logger.info("Split %d pages into %d chunks.", len(documents), len(split_docs))
     return split_docs
 
 
+@lru_cache(maxsize=32)
+def _load_page_texts(path: str, size: int, mtime_ns: int) -> Tuple[str, ...]:
+    return tuple(doc.page_content for doc in PyPDFLoader(path).load())
+
+
+def load_page_texts(path: str) -> Tuple[str, ...]:
+    """
+    返回 PDF 每一页的文本（与建立索引时使用同一加载器，
+    因此文本块的 start_index 偏移可直接用于切片）。
+    结果按文件路径、大小和修改时间缓存在进程内。
+    """
+    path = str(Path(path).absolute())
+    stat = os.stat(path)
+    return _load_page_texts(path, stat.st_size, stat.st_mtime_ns)
+
+
 def embed_documents(
     chunks: List[Document], store_name: str, embedding_model: str = "google"
-) -> FAISS:
+) -> "FAISS":
     """
     对拆分好的文本块计算嵌入向量，并利用 FAISS 构建一个向量存储，持久化存储到本地。
 
@@ -125,6 +153,10 @@ def embed_documents(
     返回:
       - 构建好的 FAISS 向量存储对象。
     """
+    from langchain_community.embeddings import OpenAIEmbeddings
+    from langchain_community.vectorstores import FAISS
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
     if embedding_model == "google":
         gemini_api_key = settings.gemini_api_key
         if not gemini_api_key:
@@ -141,7 +173,7 @@ def embed_documents(
     return vectorstore
 
 
-def load_vectorstore(store_name: str, embedding_model: str = "openai") -> FAISS:
+def load_vectorstore(store_name: str, embedding_model: str = "openai") -> "FAISS":
     """
     加载指定名称的本地 FAISS 向量存储。
 
@@ -152,6 +184,10 @@ def load_vectorstore(store_name: str, embedding_model: str = "openai") -> FAISS:
     返回:
       - 加载后的 FAISS 向量存储对象。
     """
+    from langchain_community.embeddings import OpenAIEmbeddings
+    from langchain_community.vectorstores import FAISS
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
     if embedding_model == "google":
         gemini_api_key = settings.gemini_api_key
         if not gemini_api_key:
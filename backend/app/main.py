@@ -1,18 +1,63 @@
 # backend/app/main.py
-from app.api import history, notes, process, qa, sources, summaries
+from contextlib import asynccontextmanager
+
+from app.api import admin, history, notes, process, qa, search, sources, summaries
+from app.core.compression import add_compression
 from app.core.config import settings
 from app.core.cors import add_cors
-from app.core.database import Base, engine
+from app.core.database import Base, SessionLocal, engine
 from app.core.logger import logger
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.core.migrations import run_migrations
+from app.core.profiling import ProfilingMiddleware
+from app.core.responses import json_response_class
+from app.core.upload_limit import UploadLimitMiddleware
+from app.crud.source import register_deduplicated_sources
 from app.models import history as history_model
-from app.models import note, source, summary
-from fastapi import FastAPI
+from app.models import (
+    collection_version,
+    history_turn,
+    note,
+    source,
+    stored_file,
+    summary,
+    summary_source,
+)
+from app.services.file_storage import file_storage
+from app.services.warmup import warmup_service
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 # 创建所有数据库表
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+# A rebuilt file index only knows per-source files; restore shared blob entries
+if file_storage.index_rebuilt:
+    with SessionLocal() as db:
+        register_deduplicated_sources(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server starts accepting connections
+    # (and answering /health) right away; /ready reports the progress
+    warmup_service.start()
+    yield
+
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(
+    title=settings.app_name,
+    default_response_class=json_response_class(),
+    lifespan=lifespan,
+)
+app.add_middleware(UploadLimitMiddleware)
 app = add_cors(app)
+app = add_compression(app)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.profiling_token or settings.profiling_sample_rate > 0:
+    app.add_middleware(ProfilingMiddleware)
 
 app.include_router(sources.router)
 app.include_router(process.router)
@@ -20,6 +65,8 @@ app.include_router(history.router)
 app.include_router(summaries.router)
 app.include_router(notes.router)
 app.include_router(qa.router)
+app.include_router(search.router)
+app.include_router(admin.router)
 
 logger.info(f"Starting {settings.app_name} application")
 
@@ -27,3 +74,23 @@ logger.info(f"Starting {settings.app_name} application")
 def health_check():
     logger.debug("Health check endpoint called")
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness (unlike /health, which is liveness): 503 until the background
+    warmup has opened the database and loaded the embedding model, with
+    per-step timings. Failures of the optional steps are reported but do not
+    block readiness.
+    """
+    status = warmup_service.status()
+    return JSONResponse(status, status_code=200 if status["status"] == "ready" else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Stage, database and request latency in the Prometheus text format"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
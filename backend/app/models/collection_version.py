@@ -0,0 +1,16 @@
+# backend/app/models/collection_version.py
+from app.core.database import Base
+from sqlalchemy import Column, Integer, String
+
+
+class DBCollectionVersion(Base):
+    """
+    Change counter of a collection (sources, summaries, notes), incremented by
+    database triggers on every write; list and item ETags are derived from it.
+    """
+
+    __tablename__ = "collection_versions"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    # Random per database, so ETags from a recreated database never match
+    epoch = Column(String, nullable=False)
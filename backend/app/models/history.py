@@ -1,9 +1,14 @@
 # backend/app/models/history.py
-from sqlalchemy import Column, String, Text, DateTime, func
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, func
 from app.core.database import Base
 
 class DBHistory(Base):
     __tablename__ = "histories"
+    # Keyset pagination order (created_at DESC, id DESC)
+    __table_args__ = (Index("ix_histories_created_at_id", "created_at", "id"),)
     id = Column(String, primary_key=True, index=True)
     conversation = Column(Text, nullable=False)  # 存储对话历史（用户与 LLM 的交互内容）
+    # 逐条追加的消息存放在 history_turns；已压缩的旧消息以文本形式追加到 conversation
+    turn_count = Column(Integer, nullable=False, default=0, server_default="0")
+    compacted_seq = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
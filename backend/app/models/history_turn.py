@@ -0,0 +1,20 @@
+# backend/app/models/history_turn.py
+from sqlalchemy import (
+    Column, ForeignKey, Integer, String, Text, DateTime, UniqueConstraint, func
+)
+from app.core.database import Base
+
+class DBHistoryTurn(Base):
+    __tablename__ = "history_turns"
+    # One row per message; (history_id, seq) is also the pagination key
+    __table_args__ = (
+        UniqueConstraint("history_id", "seq", name="ux_history_turns_seq"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    history_id = Column(
+        String, ForeignKey("histories.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)  # 会话内从 1 开始递增的序号
+    role = Column(String, nullable=False)  # "user" / "assistant" / "system"
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
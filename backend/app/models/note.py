@@ -1,15 +1,22 @@
 from app.core.database import Base
-from sqlalchemy import Column, DateTime, String, Text, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func
 
 
 class DBNote(Base):
     __tablename__ = "notes"
+    # Keyset pagination order (created_at DESC, id DESC)
+    __table_args__ = (Index("ix_notes_created_at_id", "created_at", "id"),)
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     content_type = Column(String, nullable=False, default="text/markdown")
     source_summary_id = Column(
-        String, nullable=True
+        String, nullable=True, index=True
     )  # Optional link to a source or summary
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Incremented on every change; clients send it back for optimistic concurrency
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # Every ORM update checks and bumps version (StaleDataError on a lost race)
+    __mapper_args__ = {"version_id_col": version}
@@ -1,8 +1,8 @@
 # backend/app/models/schemas.py
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProcessingRequest(BaseModel):
@@ -48,6 +48,22 @@ class HistoryCreate(BaseModel):
 class HistoryResponse(BaseModel):
     id: str
     conversation: str
+    turn_count: int = 0
+    compacted_seq: int = 0  # Turns up to this seq are part of `conversation`
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class HistoryTurnCreate(BaseModel):
+    role: Literal["user", "assistant", "system"]
+    content: str
+
+class HistoryTurnResponse(BaseModel):
+    history_id: str
+    seq: int
+    role: str
+    content: str
     created_at: datetime
 
     class Config:
@@ -63,6 +79,29 @@ class NoteCreate(BaseModel):
 class NoteUpdate(BaseModel):
     name: Optional[str] = None
     content: Optional[str] = None
+    # If given, the update is rejected (409) unless the note is at this version
+    version: Optional[int] = None
+
+
+class NoteEdit(BaseModel):
+    # Replace content[start:end] (Unicode code point offsets) with text
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str = ""
+
+
+class NoteEditRequest(BaseModel):
+    version: int
+    # Offsets of every edit refer to the content at `version`
+    edits: List[NoteEdit] = Field(max_length=1000)
+    name: Optional[str] = None
+
+
+class NoteEditResponse(BaseModel):
+    id: str
+    version: int
+    length: int
+    updated_at: Optional[datetime] = None
 
 
 class NoteResponse(BaseModel):
@@ -73,6 +112,45 @@ class NoteResponse(BaseModel):
     source_summary_id: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1
 
     class Config:
         from_attributes = True
+
+
+class SearchHit(BaseModel):
+    source_id: str
+    # All requested sources with this content (uploads of identical files
+    # share one stored file and index), source_id first
+    source_ids: List[str] = []
+    filename: str
+    page: Optional[int] = None  # 1-based page number in the PDF
+    score: float
+    content: str
+
+
+class SearchResponse(BaseModel):
+    query: str
+    offset: int
+    limit: int
+    has_more: bool
+    took_ms: float
+    results: List[SearchHit]
+
+
+class TextSearchHit(BaseModel):
+    type: Literal["note", "summary", "history"]
+    id: str
+    title: Optional[str] = None
+    snippet: str  # HTML-escaped, matched terms wrapped in <mark></mark>
+    score: float
+    created_at: Optional[datetime] = None
+
+
+class TextSearchResponse(BaseModel):
+    query: str
+    offset: int
+    limit: int
+    has_more: bool
+    took_ms: float
+    results: List[TextSearchHit]
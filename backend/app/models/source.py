@@ -1,10 +1,19 @@
 # backend/app/models/source.py
-from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy import Column, Index, String, DateTime, func
 from app.core.database import Base
 
 class DBSource(Base):
     __tablename__ = "sources"
+    __table_args__ = (
+        # Keyset pagination order (created_at DESC, id DESC)
+        Index("ix_sources_created_at_id", "created_at", "id"),
+        # Duplicate-name resolution on upload/rename (see crud.source.resolve_filename)
+        Index("ux_sources_filename", "filename", unique=True),
+    )
     id = Column(String, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     content_type = Column(String, nullable=False)
+    # SHA-256 of the file; sources with the same content share one DBStoredFile.
+    # NULL for sources uploaded before deduplication (stored per source id).
+    content_hash = Column(String, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
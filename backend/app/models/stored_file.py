@@ -0,0 +1,14 @@
+# backend/app/models/stored_file.py
+from app.core.database import Base
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, func
+
+
+class DBStoredFile(Base):
+    """Content-addressed file shared by every DBSource with the same content_hash."""
+
+    __tablename__ = "stored_files"
+    content_hash = Column(String, primary_key=True)  # SHA-256 of the file bytes
+    path = Column(String, nullable=False)  # Relative to settings.upload_dir
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,13 +1,31 @@
 # backend/app/models/summary.py
 from app.core.database import Base
-from sqlalchemy import Column, DateTime, String, Text, func
+from sqlalchemy import Column, DateTime, Index, String, Text, func
+from sqlalchemy.orm import relationship
+
+from .summary_source import DBSummarySource
 
 
 class DBSummary(Base):
     __tablename__ = "summaries"
+    # Keyset pagination order (created_at DESC, id DESC)
+    __table_args__ = (Index("ix_summaries_created_at_id", "created_at", "id"),)
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=True)  # Optional name field for saving summaries
-    source_ids = Column(String, nullable=False)  # 存储关联的多个源文件 ID（以逗号分隔）
+    # 逗号分隔的源文件 ID（旧格式，仍然写入以兼容旧版本；查询请使用 source_links）
+    source_ids = Column(String, nullable=False)
     markdown = Column(Text, nullable=False)      # LLM 生成的 Markdown 摘要
     vector_index_path = Column(String, nullable=True)  # 可选：持久化 FAISS 索引的文件路径
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    source_links = relationship(
+        DBSummarySource,
+        order_by=DBSummarySource.position,
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def source_id_list(self) -> list[str]:
+        """关联的源文件 ID 列表（按生成时的顺序）。"""
+        if self.source_links:
+            return [link.source_id for link in self.source_links]
+        return self.source_ids.split(",") if self.source_ids else []
@@ -0,0 +1,15 @@
+# backend/app/models/summary_source.py
+from app.core.database import Base
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+
+class DBSummarySource(Base):
+    """Association between a summary and one of the sources it was generated from."""
+
+    __tablename__ = "summary_sources"
+    summary_id = Column(
+        String, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Not a foreign key: deleting a source keeps the summaries generated from it
+    source_id = Column(String, primary_key=True, index=True)
+    position = Column(Integer, nullable=False, default=0)  # Order in the request
@@ -1,106 +1,350 @@
 # backend/app/services/file_storage.py
+import hashlib
 import os
+import threading
+import uuid
 from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 
+import aiofiles
 from app.core.config import settings
-from app.core.logger import logger
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Append-only journal of "+<key>\t<relative path>" / "-<key>" lines
+INDEX_FILENAME = "index.log"
+# Rewrite the journal on startup once it holds this many times more lines than live entries
+INDEX_COMPACT_RATIO = 2
+
+
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds settings.max_upload_size."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File exceeds the maximum upload size of {max_size} bytes")
+
+
+def _normalize_id(source_id: str) -> str:
+    """Canonical index key: case/spacing-insensitive and without a .pdf suffix."""
+    key = source_id.lower().replace(" ", "")
+    if key.endswith(".pdf"):
+        key = key[:-4]
+    return key
 
 
 class FileStorageService:
     def __init__(self):
         # Get absolute path to upload directory
         self.upload_dir = settings.upload_dir.resolve()
-        logger.debug(f"Initializing file storage with directory: {self.upload_dir}")
+        logger.debug("Initializing file storage with directory: %s", self.upload_dir)
 
         # Ensure the upload directory exists
         if not self.upload_dir.exists():
-            logger.info(f"Creating upload directory: {self.upload_dir}")
+            logger.info("Creating upload directory: %s", self.upload_dir)
             self.upload_dir.mkdir(parents=True, exist_ok=True)
             # Ensure the directory is readable/writable
             os.chmod(self.upload_dir, 0o755)
         else:
-            logger.debug(f"Upload directory already exists: {self.upload_dir}")
+            logger.debug("Upload directory already exists: %s", self.upload_dir)
 
         # Double-check that the directory is accessible
         if not os.access(self.upload_dir, os.R_OK | os.W_OK):
             logger.warning(
-                f"Upload directory has incorrect permissions: {self.upload_dir}"
+                "Upload directory has incorrect permissions: %s", self.upload_dir
             )
             try:
                 os.chmod(self.upload_dir, 0o755)
                 logger.info(
-                    f"Fixed permissions for upload directory: {self.upload_dir}"
+                    "Fixed permissions for upload directory: %s", self.upload_dir
                 )
             except Exception as e:
-                logger.error(f"Failed to fix permissions: {str(e)}")
+                logger.error("Failed to fix permissions: %s", e)
 
-    def get_file_path(self, source_id: str) -> Path:
-        # Check if the source_id already ends with .pdf
-        if source_id.lower().endswith(".pdf"):
-            file_path = self.upload_dir / f"{source_id}"
-            logger.debug(f"Using source ID with existing PDF extension: {source_id}")
+        # In-memory id -> path (relative to upload_dir) index, persisted as a journal
+        self._lock = threading.Lock()
+        self._index: Dict[str, str] = {}
+        self._index_file = self.upload_dir / INDEX_FILENAME
+        self.index_rebuilt = False
+        self._load_index()
+
+    # ------------------------------------------------------------------ #
+    # Index persistence
+    # ------------------------------------------------------------------ #
+
+    def _load_index(self):
+        """Replay the index journal, or rebuild it with a one-off scan if missing."""
+        if not self._index_file.exists():
+            self.rebuild_index()
+            return
+
+        lines = 0
+        with open(self._index_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                lines += 1
+                if line.startswith("+") and "\t" in line:
+                    key, rel_path = line[1:].split("\t", 1)
+                    self._index[key] = rel_path
+                elif line.startswith("-"):
+                    self._index.pop(line[1:], None)
+        logger.info("Loaded file index with %d entries", len(self._index))
+
+        if lines > INDEX_COMPACT_RATIO * max(len(self._index), 1):
+            self._write_index()
+
+    def _write_index(self):
+        """Atomically rewrite the journal with only the live entries."""
+        tmp_file = self._index_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for key, rel_path in self._index.items():
+                f.write(f"+{key}\t{rel_path}\n")
+        os.replace(tmp_file, self._index_file)
+        logger.debug("Compacted file index to %d entries", len(self._index))
+
+    def _append(self, line: str):
+        with open(self._index_file, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def rebuild_index(self):
+        """
+        Rebuild the index from a full scan of the upload directory.
+
+        Only needed once (first start after upgrading, or if the journal is lost);
+        regular lookups never scan the directory.
+        """
+        logger.info("Rebuilding file index from %s", self.upload_dir)
+        index = {}
+        for file_path in self.upload_dir.rglob("*.pdf"):
+            # Shared blobs are keyed by hash, not source id; see
+            # crud.source.register_deduplicated_sources
+            if file_path.relative_to(self.upload_dir).parts[0] in ("blobs", "tmp"):
+                continue
+            if file_path.is_file():
+                index[_normalize_id(file_path.name)] = str(
+                    file_path.relative_to(self.upload_dir)
+                )
+        with self._lock:
+            self._index = index
+            self._write_index()
+        self.index_rebuilt = True
+        logger.info("File index rebuilt with %d entries", len(index))
+
+    # ------------------------------------------------------------------ #
+    # Index maintenance
+    # ------------------------------------------------------------------ #
+
+    def sharded_path(self, source_id: str) -> Path:
+        """
+        Canonical location for a new file: <upload_dir>/ab/cd/<source_id>.pdf,
+        so no directory grows beyond a few hundred entries.
+        """
+        key = _normalize_id(source_id)
+        return self.upload_dir / key[:2] / key[2:4] / f"{key}.pdf"
+
+    def register(self, source_id: str, file_path: Path):
+        """Record where a source's file is stored."""
+        key = _normalize_id(source_id)
+        rel_path = str(Path(file_path).resolve().relative_to(self.upload_dir))
+        with self._lock:
+            if self._index.get(key) == rel_path:
+                return
+            self._index[key] = rel_path
+            self._append(f"+{key}\t{rel_path}")
+        logger.debug("Indexed file for source %s: %s", source_id, rel_path)
+
+    def unregister(self, source_id: str):
+        """Forget a source's file location."""
+        key = _normalize_id(source_id)
+        with self._lock:
+            if self._index.pop(key, None) is not None:
+                self._append(f"-{key}")
+
+    def delete_file(self, source_id: str) -> bool:
+        """
+        Remove a source's file from disk and from the index.
+
+        Returns:
+            True if a file was removed, False if there was nothing to remove
+        """
+        file_path = self.get_file_path(source_id)
+        removed = False
+        if file_path.exists():
+            os.remove(file_path)
+            removed = True
+        self.unregister(source_id)
+        return removed
+
+    def migrate_layout(self) -> int:
+        """
+        Move files still stored in the legacy flat layout into the sharded layout.
+
+        Returns:
+            Number of files moved
+        """
+        moved = 0
+        with self._lock:
+            entries = list(self._index.items())
+        for key, rel_path in entries:
+            current = self.upload_dir / rel_path
+            target = self.sharded_path(key)
+            if current == target or not current.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(current, target)
+            self.register(key, target)
+            moved += 1
+            logger.info("Moved %s -> %s", current, target)
+        return moved
+
+    # ------------------------------------------------------------------ #
+    # Streaming uploads
+    # ------------------------------------------------------------------ #
+
+    async def stream_to_temp(self, upload) -> Tuple[Path, int, str]:
+        """
+        Stream an upload to a temporary file in fixed-size chunks.
+
+        Memory use is bounded by settings.upload_chunk_size regardless of the
+        file size, and the SHA-256 digest is computed while writing.
+
+        Args:
+            upload: Object with an async read(size) method (e.g. UploadFile)
+
+        Returns:
+            (temporary path, size in bytes, hex SHA-256 digest)
+
+        Raises:
+            FileTooLargeError: If the upload exceeds settings.max_upload_size
+        """
+        tmp_dir = self.upload_dir / "tmp"
+        tmp_dir.mkdir(exist_ok=True)
+        tmp_path = tmp_dir / f"{uuid.uuid4()}.part"
+
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as out_file:
+                while True:
+                    chunk = await upload.read(settings.upload_chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > settings.max_upload_size:
+                        raise FileTooLargeError(settings.max_upload_size)
+                    hasher.update(chunk)
+                    await out_file.write(chunk)
+        except BaseException:
+            self.discard_temp(tmp_path)
+            raise
+
+        return tmp_path, size, hasher.hexdigest()
+
+    def blob_path(self, content_hash: str) -> Path:
+        """Content-addressed location shared by all sources with this content."""
+        return (
+            self.upload_dir
+            / "blobs"
+            / content_hash[:2]
+            / content_hash[2:4]
+            / f"{content_hash}.pdf"
+        )
+
+    def commit_blob(self, tmp_path: Path, content_hash: str) -> Path:
+        """
+        Atomically publish a streamed temporary file at its content-addressed
+        path. An existing blob is kept untouched (its mtime keys the derived
+        indexes) and the temporary file is discarded.
+        """
+        file_path = self.blob_path(content_hash)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Creates the blob only if it does not exist yet, atomically
+            os.link(tmp_path, file_path)
+        except FileExistsError:
+            logger.debug("Blob %s already stored, discarding the upload", content_hash)
+        except OSError:
+            # No hard links on this filesystem
+            if not file_path.exists():
+                os.replace(tmp_path, file_path)
+                return file_path
+        self.discard_temp(tmp_path)
+        return file_path
+
+    def remove_blob(self, content_hash: str, still_referenced: Callable[[], bool]):
+        """
+        Remove a blob after its last reference was committed.
+
+        The blob is first moved aside; if a concurrent upload re-acquired the
+        content in the meantime it is put back instead of being deleted.
+        """
+        file_path = self.blob_path(content_hash)
+        trash_path = self.upload_dir / "tmp" / f"{content_hash}.{uuid.uuid4()}.deleted"
+        trash_path.parent.mkdir(exist_ok=True)
+        try:
+            os.replace(file_path, trash_path)
+        except FileNotFoundError:
+            return
+        if still_referenced() and not file_path.exists():
+            os.replace(trash_path, file_path)
+            logger.info("Blob %s was re-acquired, keeping it", content_hash)
         else:
-            # Generate the absolute path to the file
-            file_path = self.upload_dir / f"{source_id}.pdf"
-            logger.debug(f"Generated file path for source {source_id}: {file_path}")
+            self.discard_temp(trash_path)
 
-        # Ensure the parent directory exists
-        if not file_path.parent.exists():
-            logger.warning(
-                f"Parent directory doesn't exist, creating: {file_path.parent}"
-            )
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+    def discard_temp(self, tmp_path: Path):
+        """Remove a temporary upload file, ignoring it if already gone."""
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
 
-        # Check if file exists, if not try alternate methods to find it
-        if not file_path.exists():
-            # Try listing all files in directory to find a case-insensitive match or handle spaces
-            logger.debug(f"File not found at {file_path}, checking for alternatives")
-            try:
-                for existing_file in self.upload_dir.iterdir():
-                    if existing_file.is_file():
-                        # Compare without case sensitivity and normalize spaces
-                        expected_name = file_path.name.lower().replace(" ", "")
-                        actual_name = existing_file.name.lower().replace(" ", "")
-
-                        if expected_name == actual_name:
-                            logger.info(
-                                f"Found matching file with different case/spacing: {existing_file}"
-                            )
-                            return existing_file
-
-                        # Also check without .pdf extension
-                        if source_id.lower().endswith(".pdf"):
-                            base_name = source_id[:-4].lower().replace(" ", "")
-                            actual_base = existing_file.stem.lower().replace(" ", "")
-                            if base_name == actual_base:
-                                logger.info(
-                                    f"Found matching file by base name: {existing_file}"
-                                )
-                                return existing_file
-            except Exception as e:
-                logger.error(f"Error while searching for alternative files: {e}")
+    # ------------------------------------------------------------------ #
+    # Lookups
+    # ------------------------------------------------------------------ #
 
+    def _lookup(self, source_id: str) -> Optional[Path]:
+        key = _normalize_id(source_id)
+        with self._lock:
+            rel_path = self._index.get(key)
+        if rel_path is not None:
+            return self.upload_dir / rel_path
+
+        # Not indexed (e.g. written by an older version): probe the two known
+        # layouts directly instead of scanning the directory
+        for candidate in (self.sharded_path(key), self.upload_dir / f"{key}.pdf"):
+            if candidate.exists():
+                logger.info(
+                    "Found unindexed file for source %s: %s", source_id, candidate
+                )
+                self.register(key, candidate)
+                return candidate
+        return None
+
+    def get_file_path(self, source_id: str) -> Path:
+        """
+        Return the stored file path for a source.
+
+        Files that are not stored yet resolve to their sharded location; callers
+        writing to it must create the parent directory and call register().
+        """
+        file_path = self._lookup(source_id)
+        if file_path is None:
+            file_path = self.sharded_path(source_id)
+            logger.debug("Generated file path for source %s: %s", source_id, file_path)
         return file_path
 
     def file_exists(self, source_id: str) -> bool:
         """Verify if a source file physically exists."""
-        file_path = self.get_file_path(source_id)
-        exists = file_path.exists()
+        file_path = self._lookup(source_id)
+        exists = file_path is not None and file_path.exists()
         if not exists:
-            # Log alternative paths that were checked to aid debugging
-            logger.debug(f"File not found at expected path: {file_path}")
-
-            # Check if file exists in current working directory as fallback
-            cwd_path = Path.cwd() / "uploaded_sources" / f"{source_id}.pdf"
-            if cwd_path.exists():
-                logger.warning(
-                    f"File found in CWD but not in configured path: {cwd_path}"
-                )
-
+            logger.debug("File not found for source %s", source_id)
         return exists
 
 
 file_storage = FileStorageService()
 logger.info(
-    f"File storage service initialized with upload directory: {file_storage.upload_dir}"
+    "File storage service initialized with upload directory: %s",
+    file_storage.upload_dir,
 )
@@ -0,0 +1,163 @@
+# backend/app/services/warmup.py
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logger import get_logger
+from app.core.metrics import observe_stage
+from sqlalchemy import text
+
+logger = get_logger(__name__)
+
+# Step states; the service is ready once every step is "ok" or "skipped"
+PENDING, RUNNING, OK, FAILED, SKIPPED = "pending", "running", "ok", "failed", "skipped"
+# A required step that failed and will be attempted again
+RETRYING = "retrying"
+# Steps that only save the first request some work: their failure is reported
+# but does not keep the service from becoming ready
+OPTIONAL_STEPS = ("llm_client", "embedding_search")
+
+
+def _warm_database():
+    """Open a pooled connection (and the SQLite file) before the first request"""
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+
+
+def _warm_embeddings():
+    """Import the RAG stack and load the embedding model"""
+    from app.langchain_agent.rag_agent import get_embeddings
+
+    get_embeddings()
+
+
+def _warm_llm():
+    """Import the model SDK and create the default LLM client (no API call)"""
+    from app.langchain_agent.llm_config import get_llm
+
+    get_llm(settings.warmup_llm_model)
+
+
+def _probe_search():
+    """Embed two sentences and search them, exercising the model and FAISS once"""
+    from app.langchain_agent.rag_agent import get_embeddings
+    from app.langchain_agent.retrieval import cosine_relevance
+    from langchain_community.vectorstores import FAISS
+
+    vectorstore = FAISS.from_texts(
+        ["Warmup probe document.", "A second document."],
+        get_embeddings(),
+        relevance_score_fn=cosine_relevance,
+    )
+    vectorstore.similarity_search_with_relevance_scores("warmup probe", k=1)
+
+
+class WarmupService:
+    """
+    Runs the warmup steps once in a background thread and reports their
+    progress for the /ready endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self.steps: Dict[str, Dict] = {
+            name: {
+                "status": PENDING,
+                "seconds": None,
+                "error": None,
+                "attempts": 0,
+                "retry_in": None,
+            }
+            for name, _ in self._plan()
+        }
+
+    def _plan(self) -> List[Tuple[str, Callable[[], None]]]:
+        steps = [("database", _warm_database)]
+        if settings.warmup_enabled:
+            steps.append(("embedding_model", _warm_embeddings))
+            if settings.warmup_llm_model:
+                steps.append(("llm_client", _warm_llm))
+            if settings.warmup_probe:
+                steps.append(("embedding_search", _probe_search))
+        return steps
+
+    def start(self):
+        """Start warming up in a daemon thread (does nothing if already started)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="warmup", daemon=True
+            )
+        self._thread.start()
+
+    def _run(self):
+        started = time.perf_counter()
+        for name, step in self._plan():
+            # The probe needs the embedding model; skip it if loading failed
+            if (
+                name == "embedding_search"
+                and self.steps["embedding_model"]["status"] != OK
+            ):
+                self._update(name, status=SKIPPED)
+                continue
+            # Required steps are retried with exponential backoff until they
+            # succeed, so a transient failure (e.g. a model download) does not
+            # keep the service unready for the life of the process
+            delay = settings.warmup_retry_delay
+            attempt = 1
+            while not self._attempt(name, step, attempt) and name not in OPTIONAL_STEPS:
+                self._update(name, status=RETRYING, retry_in=delay)
+                time.sleep(delay)
+                delay = min(delay * 2, settings.warmup_retry_max_delay)
+                attempt += 1
+        logger.info("Warmup finished in %.2fs", time.perf_counter() - started)
+
+    def _attempt(self, name: str, step: Callable[[], None], attempt: int) -> bool:
+        self._update(name, status=RUNNING, attempts=attempt)
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            seconds = time.perf_counter() - step_started
+            log = logger.warning if name in OPTIONAL_STEPS else logger.error
+            log(
+                "Warmup step %s failed (attempt %d): %s", name, attempt, e, exc_info=True
+            )
+            self._update(name, status=FAILED, seconds=round(seconds, 3), error=str(e))
+            observe_stage(f"warmup_{name}", seconds, failed=True)
+            return False
+        seconds = time.perf_counter() - step_started
+        self._update(
+            name, status=OK, seconds=round(seconds, 3), error=None, retry_in=None
+        )
+        observe_stage(f"warmup_{name}", seconds)
+        logger.info("Warmup step %s finished in %.2fs", name, seconds)
+        return True
+
+    def _update(self, name: str, **values):
+        with self._lock:
+            self.steps[name] = {**self.steps[name], **values}
+
+    def status(self) -> Dict:
+        with self._lock:
+            steps = {name: dict(step) for name, step in self.steps.items()}
+        statuses = {
+            # A failed optional step counts as done
+            SKIPPED if name in OPTIONAL_STEPS and step["status"] == FAILED
+            else step["status"]
+            for name, step in steps.items()
+        }
+        if statuses <= {OK, SKIPPED}:
+            status = "ready"
+        elif RETRYING in statuses:
+            status = "retrying"
+        else:
+            status = "warming_up"
+        return {"status": status, "steps": steps}
+
+
+warmup_service = WarmupService()
@@ -41,6 +41,8 @@ def query_qa(
         "question": question_text,
         "source_ids": source_ids,
         "llm_model": llm_model,
+        # The quality metrics need the retrieved chunk text
+        "include_contexts": True,
     }
 
     # Initialize result dictionary with defaults
@@ -94,6 +96,95 @@ def query_qa(
     return result
 
 
+def query_qa_batch(
+    questions: List[str],
+    source_ids: List[str],
+    llm_model: str = "gemma3",
+    concurrency: Optional[int] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Query the backend batch QA endpoint with several questions for one source set.
+
+    Args:
+        questions: The questions to ask
+        source_ids: List of document IDs to use as sources
+        llm_model: The LLM model to use (default: "gemma3")
+        concurrency: Optional limit on concurrent generations server-side
+        timeout: Request timeout in seconds (for the whole stream)
+
+    Returns:
+        Dictionary containing:
+        - results: One dict per question, in question order, with the same
+          answer/contexts/references/error keys as query_qa plus "latency"
+          (seconds from request start until that result arrived)
+        - latency: Time taken for the whole batch (float)
+        - status_code: HTTP status code (int)
+        - error: Error message if any (Optional[str])
+    """
+    endpoint_url = f"{API_BASE_URL}/qa/batch"
+
+    payload = {
+        "questions": questions,
+        "source_ids": source_ids,
+        "llm_model": llm_model,
+        # The quality metrics need the retrieved chunk text
+        "include_contexts": True,
+    }
+    if concurrency is not None:
+        payload["concurrency"] = concurrency
+
+    result = {
+        "results": [None] * len(questions),
+        "latency": 0.0,
+        "status_code": 0,
+        "error": None,
+    }
+
+    try:
+        start_time = time.perf_counter()
+
+        with requests.post(
+            endpoint_url, json=payload, timeout=timeout, stream=True
+        ) as response:
+            result["status_code"] = response.status_code
+
+            if response.status_code == 200:
+                # Results arrive as newline-delimited JSON in completion order
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    item = json.loads(line)
+                    if item.get("index") is None:
+                        result["error"] = item.get("error")
+                        continue
+                    result["results"][item["index"]] = {
+                        "answer": item.get("answer") or "",
+                        "contexts": item.get("contexts", []),
+                        "references": item.get("references", []),
+                        "error": item.get("error"),
+                        "latency": time.perf_counter() - start_time,
+                    }
+            else:
+                result["error"] = f"API error: HTTP {response.status_code}"
+                try:
+                    error_detail = response.json().get("detail", "No detail provided")
+                    result["error"] += f" - {error_detail}"
+                except ValueError:
+                    result["error"] += f" - {response.text[:100]}"
+
+        result["latency"] = time.perf_counter() - start_time
+
+    except Timeout:
+        result["error"] = f"Request timed out after {timeout} seconds"
+    except RequestException as e:
+        result["error"] = f"Request failed: {str(e)}"
+    except Exception as e:
+        result["error"] = f"Unexpected error: {str(e)}"
+
+    return result
+
+
 def upload_source(
     file_path: str, filename: Optional[str] = None, timeout: int = DEFAULT_TIMEOUT
 ) -> Dict[str, Any]:
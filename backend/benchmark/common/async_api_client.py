@@ -0,0 +1,169 @@
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .api_client import API_BASE_URL, DEFAULT_TIMEOUT
+
+# Error reported for requests that hit the client timeout
+TIMEOUT_ERROR = "Request timed out"
+
+
+def create_client(
+    base_url: str = API_BASE_URL,
+    max_connections: int = 100,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """
+    Create a pooled async client; share one client between concurrent requests
+    so connections are kept alive and reused.
+
+    Args:
+        base_url: Backend URL
+        max_connections: Connection pool size (keep >= the number of in-flight requests)
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        An httpx.AsyncClient (close it with `await client.aclose()`)
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+
+
+def _error_message(response: httpx.Response) -> str:
+    message = f"API error: HTTP {response.status_code}"
+    try:
+        return f"{message} - {response.json().get('detail', 'No detail provided')}"
+    except ValueError:
+        return f"{message} - {response.text[:100]}"
+
+
+async def query_qa(
+    client: httpx.AsyncClient,
+    question_text: str,
+    source_ids: List[str],
+    llm_model: str = "gemma3",
+) -> Dict[str, Any]:
+    """
+    Query the backend QA endpoint with a question.
+
+    Args:
+        client: Client from create_client()
+        question_text: The question to ask
+        source_ids: List of document IDs to use as sources
+        llm_model: The LLM model to use (default: "gemma3")
+
+    Returns:
+        Dictionary containing:
+        - answer: The generated answer (str)
+        - latency: Time taken for the API call (float)
+        - status_code: HTTP status code (int, 0 if no response)
+        - response_bytes: Size of the response body (int)
+        - error: Error message if any (Optional[str])
+    """
+    payload = {
+        "question": question_text,
+        "source_ids": source_ids,
+        "llm_model": llm_model,
+    }
+    result = {
+        "answer": "",
+        "latency": 0.0,
+        "status_code": 0,
+        "response_bytes": 0,
+        "error": None,
+    }
+
+    start_time = time.perf_counter()
+    try:
+        response = await client.post("/qa", json=payload)
+        result["status_code"] = response.status_code
+        result["response_bytes"] = len(response.content)
+        if response.status_code == 200:
+            result["answer"] = response.json().get("answer", "")
+        else:
+            result["error"] = _error_message(response)
+    except httpx.TimeoutException:
+        result["error"] = TIMEOUT_ERROR
+    except httpx.HTTPError as e:
+        result["error"] = f"Request failed: {type(e).__name__}: {str(e)}"
+    result["latency"] = time.perf_counter() - start_time
+
+    return result
+
+
+async def upload_source(
+    client: httpx.AsyncClient,
+    file_path: Path,
+    filename: Optional[str] = None,
+    content: Optional[bytes] = None,
+) -> Dict[str, Any]:
+    """
+    Upload a source file to the backend.
+
+    Args:
+        client: Client from create_client()
+        file_path: Path to the file to upload
+        filename: Optional filename to use (defaults to the file's name)
+        content: Optional file content (read from file_path if not given)
+
+    Returns:
+        Dictionary containing:
+        - source_id: ID of the uploaded source (str) if successful
+        - latency: Time taken for the API call (float)
+        - status_code: HTTP status code (int, 0 if no response)
+        - response_bytes: Size of the response body (int)
+        - error: Error message if any (Optional[str])
+    """
+    if content is None:
+        content = Path(file_path).read_bytes()
+    files = {"file": (filename or Path(file_path).name, content, "application/pdf")}
+    result = {
+        "source_id": "",
+        "latency": 0.0,
+        "status_code": 0,
+        "response_bytes": 0,
+        "error": None,
+    }
+
+    start_time = time.perf_counter()
+    try:
+        response = await client.post("/sources", files=files)
+        result["status_code"] = response.status_code
+        result["response_bytes"] = len(response.content)
+        if response.status_code == 200:
+            result["source_id"] = response.json().get("id", "")
+        else:
+            result["error"] = _error_message(response)
+    except httpx.TimeoutException:
+        result["error"] = TIMEOUT_ERROR
+    except httpx.HTTPError as e:
+        result["error"] = f"Request failed: {type(e).__name__}: {str(e)}"
+    result["latency"] = time.perf_counter() - start_time
+
+    return result
+
+
+async def delete_source(client: httpx.AsyncClient, source_id: str) -> bool:
+    """
+    Delete a source from the backend.
+
+    Args:
+        client: Client from create_client()
+        source_id: ID of the source to delete
+
+    Returns:
+        Whether the source was deleted
+    """
+    try:
+        response = await client.delete(f"/sources/{source_id}")
+        return response.status_code == 204
+    except httpx.HTTPError:
+        return False
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Concurrent Load Test for the QA and Upload APIs
+
+Replays benchmark/data/test_questions.csv against a running backend with many
+requests in flight, using one pooled httpx.AsyncClient:
+- closed loop (--concurrency N): N workers each send their next request as
+  soon as the previous one finishes
+- open loop (--rate R): requests arrive as a Poisson process at R requests/s
+  regardless of how fast the server answers (at most --max-in-flight at once)
+
+In open-loop mode latency is measured from each request's scheduled arrival,
+so time spent waiting for a free in-flight slot counts (no coordinated
+omission); service_ms is the time from sending to the response.
+
+The mix of endpoints is set with --mix, e.g. "qa:9,upload:1". QA requests cycle
+through the questions and --models; uploads send the PDFs in benchmark/sources
+under unique names and the created sources are deleted afterwards (unless
+--keep-uploads).
+
+Prerequisites:
+- Backend server running at --base-url
+- The source documents referenced in test_questions.csv available to the
+  backend (as for test_response_quality.py)
+
+Results:
+- benchmark/results/load_requests.csv: one row per request
+- benchmark/results/load_summary.csv: per endpoint and model: requests,
+  errors, error_rate, timeouts, no_response (timeouts and connection
+  errors), throughput_rps and p50/p95/p99/mean/max latency
+
+Usage (from the backend directory):
+    python benchmark/test_api_load.py --concurrency 8 --requests 200
+    python benchmark/test_api_load.py --rate 5 --duration 60 --mix qa:9,upload:1
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark.common.api_client import API_BASE_URL, DEFAULT_TIMEOUT
+from benchmark.common.async_api_client import (
+    TIMEOUT_ERROR,
+    create_client,
+    delete_source,
+    query_qa,
+    upload_source,
+)
+from benchmark.common.utils import load_test_data
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+REQUESTS_CSV_PATH = RESULTS_DIR / "load_requests.csv"
+SUMMARY_CSV_PATH = RESULTS_DIR / "load_summary.csv"
+QUESTIONS_CSV_PATH = Path(__file__).parent / "data" / "test_questions.csv"
+SOURCES_DIR = Path(__file__).parent / "sources"
+
+ENDPOINTS = ("qa", "upload")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition(":")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in --mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class Workload:
+    """Produces the next request to send (endpoint, model and arguments)"""
+
+    def __init__(self, args):
+        self.weights = args.mix
+        questions = load_test_data(str(args.questions))
+        self.questions = itertools.cycle(
+            [
+                (row.question_text, [doc.strip() for doc in row.source_docs.split("|")])
+                for row in questions.itertuples()
+            ]
+        )
+        self.models = itertools.cycle(args.models)
+        self.pdfs = itertools.cycle(
+            [(path, path.read_bytes()) for path in sorted(SOURCES_DIR.glob("*.pdf"))]
+            if "upload" in self.weights
+            else [None]
+        )
+        self.rng = random.Random(args.seed)
+
+    def next(self) -> Tuple[str, str, tuple]:
+        endpoint = self.rng.choices(
+            list(self.weights), weights=list(self.weights.values())
+        )[0]
+        if endpoint == "qa":
+            question, source_ids = next(self.questions)
+            return "qa", next(self.models), (question, source_ids)
+        path, content = next(self.pdfs)
+        # Unique names avoid the auto-rename lookups; content is deduplicated
+        filename = f"load-{uuid.uuid4().hex[:8]}-{path.name}"
+        return "upload", "", (path, filename, content)
+
+
+async def send(client, endpoint: str, model: str, request_args: tuple) -> Dict:
+    if endpoint == "qa":
+        question, source_ids = request_args
+        return await query_qa(client, question, source_ids, model)
+    return await upload_source(client, *request_args)
+
+
+class LoadRun:
+    def __init__(self, args, client):
+        self.args = args
+        self.client = client
+        self.workload = Workload(args)
+        self.rows: List[Dict] = []
+        self.uploaded: List[str] = []
+        self.issued = 0
+        self.started = 0.0
+
+    def _more(self) -> bool:
+        if self.args.requests is not None and self.issued >= self.args.requests:
+            return False
+        if self.args.duration is not None:
+            return time.perf_counter() - self.started < self.args.duration
+        return True
+
+    async def _execute(self, scheduled: float, measured: bool):
+        endpoint, model, request_args = self.workload.next()
+        sent = time.perf_counter()
+        result = await send(self.client, endpoint, model, request_args)
+        finished = time.perf_counter()
+        if result.get("source_id"):
+            self.uploaded.append(result["source_id"])
+        if not measured:
+            return
+        self.rows.append(
+            {
+                "endpoint": endpoint,
+                "model": model,
+                "start_s": round(scheduled - self.started, 4),
+                "latency_ms": round((finished - scheduled) * 1000, 2),
+                "service_ms": round((finished - sent) * 1000, 2),
+                "status_code": result["status_code"],
+                "response_bytes": result["response_bytes"],
+                "error": result["error"],
+            }
+        )
+
+    async def warm_up(self):
+        if self.args.warmup_requests:
+            print(f"Sending {self.args.warmup_requests} warm-up requests")
+            await asyncio.gather(
+                *(
+                    self._execute(time.perf_counter(), measured=False)
+                    for _ in range(self.args.warmup_requests)
+                )
+            )
+
+    async def closed_loop(self):
+        async def worker():
+            while self._more():
+                self.issued += 1
+                await self._execute(time.perf_counter(), measured=True)
+
+        self.started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+        return time.perf_counter() - self.started
+
+    async def open_loop(self):
+        slots = asyncio.Semaphore(self.args.max_in_flight)
+        rng = random.Random(self.args.seed)
+
+        async def one(scheduled: float):
+            async with slots:
+                await self._execute(scheduled, measured=True)
+
+        tasks = []
+        self.started = next_arrival = time.perf_counter()
+        while self._more():
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.issued += 1
+            tasks.append(asyncio.create_task(one(next_arrival)))
+            next_arrival += rng.expovariate(self.args.rate)
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - self.started
+
+    async def clean_up(self):
+        if self.uploaded and not self.args.keep_uploads:
+            deleted = await asyncio.gather(
+                *(delete_source(self.client, source_id) for source_id in self.uploaded)
+            )
+            print(f"Deleted {sum(deleted)}/{len(self.uploaded)} uploaded sources")
+
+
+def summarize(df: pd.DataFrame, elapsed: float) -> pd.DataFrame:
+    rows = []
+    for (endpoint, model), group in df.groupby(["endpoint", "model"]):
+        ok = group[group["error"].isna()]
+        latencies = group["latency_ms"].to_numpy()
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "model": model or "-",
+                "requests": len(group),
+                "errors": len(group) - len(ok),
+                "error_rate": round((len(group) - len(ok)) / len(group), 4),
+                "timeouts": int((group["error"] == TIMEOUT_ERROR).sum()),
+                # Timeouts plus connection errors
+                "no_response": int((group["status_code"] == 0).sum()),
+                "throughput_rps": round(len(group) / elapsed, 3),
+                "ok_throughput_rps": round(len(ok) / elapsed, 3),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+                "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+                "mean_ms": round(float(latencies.mean()), 1),
+                "max_ms": round(float(latencies.max()), 1),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+async def run(args) -> Tuple[pd.DataFrame, float]:
+    max_connections = args.max_in_flight if args.rate else args.concurrency
+    client = create_client(args.base_url, max_connections, args.timeout)
+    load = LoadRun(args, client)
+    try:
+        await load.warm_up()
+        if args.rate:
+            print(f"Open loop: {args.rate} requests/s, at most {args.max_in_flight} in flight")
+            elapsed = await load.open_loop()
+        else:
+            print(f"Closed loop: {args.concurrency} concurrent requests")
+            elapsed = await load.closed_loop()
+        await load.clean_up()
+    finally:
+        await client.aclose()
+    return pd.DataFrame(load.rows), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    parser.add_argument("--questions", type=Path, default=QUESTIONS_CSV_PATH)
+    parser.add_argument("--models", nargs="+", default=["gemma3"])
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("qa:1"))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=None, help="Open loop arrivals per second"
+    )
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=None, help="Seconds")
+    parser.add_argument("--warmup-requests", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--keep-uploads", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.requests is None and args.duration is None:
+        args.requests = 100
+
+    df, elapsed = asyncio.run(run(args))
+    if df.empty:
+        print("No requests were measured")
+        return
+    df.to_csv(REQUESTS_CSV_PATH, index=False)
+    summary = summarize(df, elapsed)
+    summary.to_csv(SUMMARY_CSV_PATH, index=False)
+
+    print(f"\n{len(df)} requests in {elapsed:.1f}s")
+    print(summary.to_string(index=False))
+    errors = df["error"].dropna().value_counts().head(5)
+    if not errors.empty:
+        print("\nMost frequent errors:")
+        print(errors.to_string())
+    print(f"\nResults saved to {REQUESTS_CSV_PATH} and {SUMMARY_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
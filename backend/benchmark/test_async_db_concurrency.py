@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Async Database Access Load Test
+
+Compares the list/get note endpoints as they were (async routes running
+synchronous Session queries, which block the event loop) with the current routes
+using an AsyncSession (aiosqlite), under concurrent clients.
+
+Both variants are served by one uvicorn server on a seeded temporary database:
+- /legacy/notes, /legacy/notes/{id}: blocking Session queries inside async def
+- /notes, /notes/{id}: the application's notes router (AsyncSession)
+
+While each load phase runs, a probe measures the latency of a trivial endpoint,
+which shows how long the event loop is blocked by database work.
+
+Results are written to benchmark/results/async_db_concurrency.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_async_db_concurrency.py [--concurrency 8] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+import httpx
+import pandas as pd
+import uvicorn
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "async_db_concurrency.csv"
+
+PORT = 8765
+NOTE_CONTENT = "# Lecture notes\n\n" + "Some markdown content. " * 80
+
+
+def build_app(notes_count: int):
+    # Imported after DATABASE_URL points at the temporary database
+    from app.api import notes
+    from app.core.database import Base, SessionLocal, engine, get_db
+    from app.core.migrations import run_migrations
+    from app.crud.note import get_note, list_notes, list_notes_page
+    from app.models import (
+        collection_version,
+        history,
+        note,
+        source,
+        stored_file,
+        summary,
+        summary_source,
+    )
+    from app.models.note import DBNote
+    from app.models.schemas import NoteResponse
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with SessionLocal() as db:
+        ids = [str(uuid.uuid4()) for _ in range(notes_count)]
+        db.bulk_insert_mappings(
+            DBNote,
+            [
+                {"id": note_id, "name": f"note {i}", "content": NOTE_CONTENT}
+                for i, note_id in enumerate(ids)
+            ],
+        )
+        db.commit()
+
+    app = FastAPI()
+    app.include_router(notes.router)
+
+    # The previous implementation: synchronous Session inside async routes
+    @app.get("/legacy/notes", response_model=List[NoteResponse])
+    async def legacy_list(limit: int = None, db: Session = Depends(get_db)):
+        if limit is None:
+            return list_notes(db)
+        rows, _ = list_notes_page(db, limit)
+        return rows
+
+    @app.get("/legacy/notes/{note_id}", response_model=NoteResponse)
+    async def legacy_get(note_id: str, db: Session = Depends(get_db)):
+        row = get_note(db, note_id)
+        if row is None:
+            raise HTTPException(status_code=404)
+        return row
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app, ids
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def run_load(base_url, paths, concurrency):
+    latencies = []
+    probe_latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                except Exception:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_sec": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.5), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "probe_p95_ms": round(percentile(probe_latencies, 0.95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--notes", type=int, default=2000)
+    # Above db_pool_size + db_max_overflow the blocking variant can stall: handlers
+    # wait for a connection on the event loop that returns connections
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--output", type=Path, default=OUTPUT_CSV_PATH, help="CSV file to write"
+    )
+    parser.add_argument("--limit", type=int, default=50, help="list page size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        # Add parent directory to path to import app modules
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        app, ids = build_app(args.notes)
+
+        server = uvicorn.Server(
+            uvicorn.Config(app, port=PORT, log_level="warning", access_log=False)
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        rng = random.Random(0)
+        get_ids = [rng.choice(ids) for _ in range(args.requests)]
+        scenarios = {
+            "list_page": lambda prefix: [
+                f"{prefix}/notes?limit={args.limit}" for _ in range(args.requests)
+            ],
+            # What the frontend requests: every note, no pagination
+            "list_all": lambda prefix: [
+                f"{prefix}/notes" for _ in range(args.requests // 10)
+            ],
+            "get": lambda prefix: [f"{prefix}/notes/{i}" for i in get_ids],
+        }
+
+        rows = []
+        base_url = f"http://127.0.0.1:{PORT}"
+        for endpoint, make_paths in scenarios.items():
+            for variant, prefix in (("sync_session", "/legacy"), ("async_session", "")):
+                result = asyncio.run(
+                    run_load(
+                        base_url, make_paths(prefix), args.concurrency
+                    )
+                )
+                rows.append({"endpoint": endpoint, "variant": variant, **result})
+                print(rows[-1])
+
+        server.should_exit = True
+        thread.join()
+
+    df = pd.DataFrame(rows)
+    df.insert(0, "concurrency", args.concurrency)
+    df.to_csv(args.output, index=False)
+    print(df.to_string(index=False))
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search Benchmark
+
+Compares keyword search over a synthetic notes corpus using the FTS5 index
+(app.crud.text_search.search_text) with the previous alternative: a
+LIKE '%term%' scan over every note, which is what filtering the list endpoint
+results amounts to.
+
+The corpus is generated with random words from a fixed vocabulary; query terms
+are drawn from the same vocabulary at different frequencies (rare, common) plus
+a prefix query.
+
+Results are written to benchmark/results/fts_search.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_fts_search.py [--notes 100000] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.database import Base, create_db_engine
+from app.core.migrations import run_migrations
+from app.crud.text_search import search_text
+from app.models import (
+    collection_version,
+    history,
+    history_turn,
+    note,
+    source,
+    stored_file,
+    summary,
+    summary_source,
+)
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "fts_search.csv"
+
+WORDS_PER_NOTE = 120
+BATCH_SIZE = 5000
+
+
+def make_vocabulary(rng: random.Random, size: int = 20000):
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(alphabet) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def populate(Session, rng: random.Random, vocabulary, notes: int):
+    # Zipf-like weights so some words are common and most are rare
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    start = time.perf_counter()
+    with Session() as db:
+        for offset in range(0, notes, BATCH_SIZE):
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": " ".join(rng.choices(vocabulary, weights, k=4)),
+                    "content": " ".join(
+                        rng.choices(vocabulary, weights, k=WORDS_PER_NOTE)
+                    ),
+                }
+                for _ in range(min(BATCH_SIZE, notes - offset))
+            ]
+            db.execute(
+                text(
+                    "INSERT INTO notes (id, name, content, content_type, created_at) "
+                    "VALUES (:id, :name, :content, 'text/markdown', CURRENT_TIMESTAMP)"
+                ),
+                rows,
+            )
+            db.commit()
+    return time.perf_counter() - start
+
+
+def time_queries(fn, queries):
+    timings = []
+    matches = []
+    for query in queries:
+        start = time.perf_counter()
+        matches.append(fn(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, matches
+
+
+def summarize(method: str, kind: str, timings, matches):
+    ordered = sorted(timings)
+    return {
+        "method": method,
+        "query_kind": kind,
+        "queries": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+        "mean_hits": round(statistics.mean(matches), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--notes", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        elapsed = populate(Session, rng, vocabulary, args.notes)
+        db_size = os.path.getsize(f"{tmp}/bench.db") / 2**20
+        print(
+            f"Inserted {args.notes} notes in {elapsed:.1f}s "
+            f"(FTS maintained by triggers), database size {db_size:.1f} MiB"
+        )
+
+        query_sets = {
+            "common_word": rng.sample(vocabulary[:50], min(args.queries, 50)),
+            "rare_word": rng.sample(vocabulary[5000:], args.queries),
+            "two_words": [
+                f"{rng.choice(vocabulary[:200])} {rng.choice(vocabulary[200:2000])}"
+                for _ in range(args.queries)
+            ],
+            "prefix": [word[:4] for word in rng.sample(vocabulary[:2000], args.queries)],
+        }
+
+        rows = []
+        with Session() as db:
+
+            def like_scan(query):
+                conditions = " AND ".join(
+                    f"content LIKE :t{i}" for i, _ in enumerate(query.split())
+                )
+                params = {f"t{i}": f"%{t}%" for i, t in enumerate(query.split())}
+                params["limit"] = args.limit
+                return len(
+                    db.execute(
+                        text(
+                            f"SELECT id, name, content FROM notes WHERE {conditions} "
+                            "ORDER BY created_at DESC LIMIT :limit"
+                        ),
+                        params,
+                    ).all()
+                )
+
+            def fts(query):
+                hits, _ = search_text(db, query, ["note"], limit=args.limit)
+                return len(hits)
+
+            for kind, queries in query_sets.items():
+                for method, fn in (("like_scan", like_scan), ("fts5", fts)):
+                    timings, matches = time_queries(fn, queries)
+                    rows.append(summarize(method, kind, timings, matches))
+        engine.dispose()
+
+    df = pd.DataFrame(rows)
+    df.insert(0, "notes", args.notes)
+    df.to_csv(OUTPUT_CSV_PATH, index=False)
+    print(df.to_string(index=False))
+    print(f"\nResults saved to {OUTPUT_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
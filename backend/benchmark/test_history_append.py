@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+History Append Benchmark
+
+Times appending a turn (app.crud.history.append_turn) to histories whose
+compacted conversation text is 1 KB, 1 MB and 10 MB. An append only reserves
+a sequence number on histories and inserts one row into history_turns, so its
+latency should not depend on the size of the conversation; in particular the
+full-text index of the conversation must not be rebuilt by the turn_count
+update.
+
+Results are written to benchmark/results/history_append.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_history_append.py [--appends 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.database import Base, create_db_engine
+from app.core.migrations import run_migrations
+from app.crud.history import append_turn, create_history
+from app.models import (
+    collection_version,
+    history,
+    history_turn,
+    note,
+    source,
+    stored_file,
+    summary,
+    summary_source,
+)
+from sqlalchemy.orm import sessionmaker
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "history_append.csv"
+
+SIZES = {"1KB": 1024, "1MB": 1024**2, "10MB": 10 * 1024**2}
+
+
+def make_conversation(rng: random.Random, size: int) -> str:
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    words, length = [], 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="History append benchmark")
+    parser.add_argument("--appends", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/history_append.db")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        Session = sessionmaker(bind=engine)
+
+        for label, size in SIZES.items():
+            with Session() as db:
+                history_id = create_history(db, make_conversation(rng, size)).id
+                latencies = []
+                for i in range(args.appends):
+                    start = time.perf_counter()
+                    append_turn(db, history_id, "user", f"Question number {i}?")
+                    latencies.append((time.perf_counter() - start) * 1000)
+            rows.append(
+                {
+                    "conversation_size": label,
+                    "appends": args.appends,
+                    "mean_ms": round(statistics.mean(latencies), 3),
+                    "p50_ms": round(statistics.median(latencies), 3),
+                    "max_ms": round(max(latencies), 3),
+                }
+            )
+            print(f"{label}: mean {rows[-1]['mean_ms']} ms, max {rows[-1]['max_ms']} ms")
+        engine.dispose()
+
+    pd.DataFrame(rows).to_csv(OUTPUT_CSV_PATH, index=False)
+    print(f"Results saved to {OUTPUT_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
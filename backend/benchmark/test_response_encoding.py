@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Response Serialization and Compression Benchmark
+
+Measures the large JSON endpoints with the default serializer (json.dumps) and
+with orjson (FAST_JSON), each uncompressed, gzip- and brotli-compressed:
+- /summaries: every summary with its full markdown
+- /notes: every note with its content
+- /qa: an answer with its retrieved contexts (same shape as QAResponse; served
+  by a stand-in route so no LLM or vector store is needed)
+
+Text is extracted from the PDFs in benchmark/sources so compression ratios are
+representative of real documents.
+
+Two measurements per endpoint and variant:
+- render_ms: time to serialize the response body (Response.render)
+- request_ms / wire_bytes: in-process ASGI request time through the
+  application's compression middleware, and the body size sent to the client
+
+Results are written to benchmark/results/response_encoding.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_response_encoding.py [--summaries 20] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+import httpx
+import pandas as pd
+from pypdf import PdfReader
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "response_encoding.csv"
+SOURCES_DIR = Path(__file__).parent / "sources"
+
+ENCODINGS = {"identity": "identity", "gzip": "gzip", "br": "br"}
+
+
+def load_corpus(max_chars: int = 2_000_000) -> str:
+    texts = []
+    for path in sorted(SOURCES_DIR.glob("*.pdf")):
+        for page in PdfReader(path).pages:
+            texts.append(page.extract_text() or "")
+        if sum(map(len, texts)) > max_chars:
+            break
+    return "\n".join(texts)
+
+
+def slices(corpus: str, count: int, size: int) -> List[str]:
+    # Consecutive, non-overlapping text; beyond the corpus length it repeats,
+    # which makes responses compress better than real data would
+    if count * size > len(corpus):
+        print(f"Warning: {count} x {size} characters exceed the corpus, text repeats")
+    doubled = corpus + corpus
+    return [
+        doubled[(i * size) % len(corpus) : (i * size) % len(corpus) + size]
+        for i in range(count)
+    ]
+
+
+def build_app(args, corpus: str):
+    # Imported after DATABASE_URL points at the temporary database
+    from app.api import notes, summaries
+    from app.core.compression import CompressionMiddleware
+    from app.core.config import settings
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.migrations import run_migrations
+    from app.models import (
+        collection_version,
+        history,
+        note,
+        source,
+        stored_file,
+        summary,
+        summary_source,
+    )
+    from app.models.note import DBNote
+    from app.models.summary import DBSummary
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from pydantic import BaseModel
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with SessionLocal() as db:
+        db.bulk_insert_mappings(
+            DBSummary,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"summary {i}",
+                    "source_ids": str(uuid.uuid4()),
+                    "markdown": text,
+                }
+                for i, text in enumerate(
+                    slices(corpus, args.summaries, args.summary_chars)
+                )
+            ],
+        )
+        db.bulk_insert_mappings(
+            DBNote,
+            [
+                {"id": str(uuid.uuid4()), "name": f"note {i}", "content": text}
+                for i, text in enumerate(slices(corpus, args.notes, args.note_chars))
+            ],
+        )
+        db.commit()
+
+    class QAResponse(BaseModel):
+        answer: str
+        references: List[str]
+        contexts: List[str]
+
+    qa_payload = {
+        "answer": corpus[:1500],
+        "references": [f"L{i}.pdf" for i in range(args.contexts)],
+        "contexts": slices(corpus, args.contexts, args.context_chars),
+    }
+
+    apps = {}
+    for serializer, response_class in (
+        ("json", JSONResponse),
+        ("orjson", ORJSONResponse),
+    ):
+        app = FastAPI(default_response_class=response_class)
+        app.include_router(summaries.router)
+        app.include_router(notes.router)
+
+        @app.post("/qa", response_model=QAResponse)
+        async def qa():
+            return qa_payload
+
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.gzip_level,
+            brotli_quality=settings.brotli_quality,
+        )
+        apps[serializer] = (app, response_class)
+    return apps
+
+
+def time_render(response_class, content, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response_class(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def time_requests(app, method: str, path: str, encoding: str, repeat: int):
+    timings = []
+    wire_bytes = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            async with client.stream(
+                method, path, headers={"Accept-Encoding": encoding}
+            ) as response:
+                # The raw (still compressed) body is what goes on the wire
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+            timings.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            wire_bytes = len(raw)
+    return statistics.median(timings), wire_bytes
+
+
+async def json_body(app, method: str, path: str):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.request(method, path)
+        response.raise_for_status()
+        return response.json()
+
+
+async def measure(apps, endpoints, args):
+    # One event loop for every request: pooled aiosqlite connections are bound
+    # to the loop that opened them
+    from app.core.database import async_engine
+
+    rows = []
+    for endpoint, (method, path) in endpoints.items():
+        content = await json_body(apps["json"][0], method, path)
+        for serializer, (app, response_class) in apps.items():
+            render_ms = time_render(response_class, content, args.requests)
+            for encoding, accept in ENCODINGS.items():
+                request_ms, wire_bytes = await time_requests(
+                    app, method, path, accept, args.requests
+                )
+                rows.append(
+                    {
+                        "endpoint": endpoint,
+                        "serializer": serializer,
+                        "encoding": encoding,
+                        "render_ms": round(render_ms, 3),
+                        "request_ms": round(request_ms, 3),
+                        "wire_bytes": wire_bytes,
+                    }
+                )
+                print(rows[-1])
+    await async_engine.dispose()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    # Defaults stay within the ~150k characters of text in benchmark/sources
+    parser.add_argument("--summaries", type=int, default=20)
+    parser.add_argument("--summary-chars", type=int, default=6000)
+    parser.add_argument("--notes", type=int, default=40)
+    parser.add_argument("--note-chars", type=int, default=3000)
+    parser.add_argument("--contexts", type=int, default=8)
+    parser.add_argument("--context-chars", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"Loaded {len(corpus)} characters of text from {SOURCES_DIR}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        # Add parent directory to path to import app modules
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        apps = build_app(args, corpus)
+
+        endpoints = {
+            "/summaries": ("GET", "/summaries"),
+            "/notes": ("GET", "/notes"),
+            "/qa": ("POST", "/qa"),
+        }
+        rows = asyncio.run(measure(apps, endpoints, args))
+
+    df = pd.DataFrame(rows)
+    identity = df[df["encoding"] == "identity"].set_index(["endpoint", "serializer"])
+    df["ratio"] = [
+        round(row.wire_bytes / identity.loc[(row.endpoint, row.serializer), "wire_bytes"], 3)
+        for row in df.itertuples()
+    ]
+    df.to_csv(OUTPUT_CSV_PATH, index=False)
+    print(df.to_string(index=False))
+    print(f"\nResults saved to {OUTPUT_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+SQLite Throughput Benchmark
+
+Compares the default SQLAlchemy SQLite engine (what app/core/database.py used to
+create) with the tuned engine from create_db_engine() (WAL, pragmas, busy timeout,
+pooled connections) under concurrent writers and readers.
+
+Each configuration runs against a fresh temporary database file:
+- write phase: N threads each insert notes in their own short transactions
+- mixed phase: readers list/get notes while writers keep inserting
+
+Results are written to benchmark/results/sqlite_throughput.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_sqlite_throughput.py [--threads 8] [--ops 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.database import Base, create_db_engine
+from app.models.note import DBNote
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "sqlite_throughput.csv"
+
+NOTE_CONTENT = "# Lecture notes\n\n" + "Some markdown content. " * 40
+
+
+def default_engine(url: str):
+    """The engine as originally configured: no pragmas, rollback journal."""
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+
+def run_threads(worker, threads: int):
+    errors = []
+    counts = []
+
+    def _run():
+        done, failed = worker()
+        counts.append(done)
+        errors.append(failed)
+
+    pool = [threading.Thread(target=_run) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return sum(counts), sum(errors), time.perf_counter() - start
+
+
+def writer(Session, ops: int):
+    def _work():
+        done = failed = 0
+        for _ in range(ops):
+            db = Session()
+            try:
+                db.add(
+                    DBNote(id=str(uuid.uuid4()), name="bench", content=NOTE_CONTENT)
+                )
+                db.commit()
+                done += 1
+            except Exception:
+                db.rollback()
+                failed += 1
+            finally:
+                db.close()
+        return done, failed
+
+    return _work
+
+
+def reader(Session, ops: int):
+    def _work():
+        done = failed = 0
+        for _ in range(ops):
+            db = Session()
+            try:
+                notes = db.query(DBNote).limit(50).all()
+                if notes:
+                    db.query(DBNote).filter(DBNote.id == notes[-1].id).first()
+                done += 1
+            except Exception:
+                failed += 1
+            finally:
+                db.close()
+        return done, failed
+
+    return _work
+
+
+def benchmark(name: str, engine_factory, threads: int, ops: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        engine = engine_factory(url)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        rows = []
+        done, failed, elapsed = run_threads(writer(Session, ops), threads)
+        rows.append(
+            {
+                "engine": name,
+                "phase": "write",
+                "operations": done,
+                "errors": failed,
+                "seconds": round(elapsed, 3),
+                "ops_per_sec": round(done / elapsed, 1),
+            }
+        )
+
+        # Mixed: half the threads write, half read
+        write_threads = max(threads // 2, 1)
+        read_threads = max(threads - write_threads, 1)
+        results = {}
+
+        def _phase(key, worker, n):
+            results[key] = run_threads(worker, n)
+
+        start = time.perf_counter()
+        phase_threads = [
+            threading.Thread(
+                target=_phase, args=("write", writer(Session, ops), write_threads)
+            ),
+            threading.Thread(
+                target=_phase, args=("read", reader(Session, ops), read_threads)
+            ),
+        ]
+        for t in phase_threads:
+            t.start()
+        for t in phase_threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        for key in ("write", "read"):
+            done, failed, _ = results[key]
+            rows.append(
+                {
+                    "engine": name,
+                    "phase": f"mixed_{key}",
+                    "operations": done,
+                    "errors": failed,
+                    "seconds": round(elapsed, 3),
+                    "ops_per_sec": round(done / elapsed, 1),
+                }
+            )
+        engine.dispose()
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="operations per thread")
+    args = parser.parse_args()
+
+    rows = []
+    rows += benchmark("default", default_engine, args.threads, args.ops)
+    rows += benchmark("tuned", create_db_engine, args.threads, args.ops)
+
+    df = pd.DataFrame(rows)
+    df.to_csv(OUTPUT_CSV_PATH, index=False)
+    print(df.to_string(index=False))
+    print(f"\nResults saved to {OUTPUT_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Startup and Import Time Benchmark
+
+Measures what each entry point costs to import in a fresh interpreter, using
+`python -X importtime`:
+- app.main: API startup (what uvicorn imports before binding the port)
+- app.langchain_agent.rag_agent: imported on the first /qa or /search request
+- app.langchain_agent.agent: imported on the first /process request
+- langchain_huggingface: imported when the embedding model is first created
+
+Import times are summed per top-level package (self time of every module of
+the package), so a dependency creeping back into the startup path shows up as
+a new row under app.main. The "(total)" row is the cumulative import time of
+the target itself.
+
+Results are written to benchmark/results/startup_time.csv.
+
+Usage (from the backend directory):
+    python benchmark/test_startup_time.py [--runs 5] [--targets app.main ...]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+RESULTS_DIR.mkdir(exist_ok=True)
+OUTPUT_CSV_PATH = RESULTS_DIR / "startup_time.csv"
+
+DEFAULT_TARGETS = [
+    "app.main",
+    "app.langchain_agent.rag_agent",
+    "app.langchain_agent.agent",
+    "langchain_huggingface",
+]
+
+
+def import_profile(
+    target: str, env: Dict[str, str], cwd: str
+) -> Optional[Dict[str, float]]:
+    """
+    Import `target` in a fresh interpreter. Returns milliseconds of self time
+    per top-level package plus "(total)", or None if the import failed.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        print(f"  {target} failed to import: {last_line[0]}")
+        return None
+
+    packages: Dict[str, float] = defaultdict(float)
+    total = 0.0
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        module = name.strip()
+        packages[module.split(".")[0]] += int(self_us) / 1000
+        if module == target:
+            total = int(cumulative_us) / 1000
+    packages["(total)"] = total
+    return packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS)
+    parser.add_argument(
+        "--top", type=int, default=15, help="Packages to print per target"
+    )
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.main creates its database, log and upload directories on import;
+        # run in a temporary directory to keep them out of the backend
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+            UPLOAD_DIR=f"{tmp}/uploaded_sources",
+            PYTHONPATH=os.pathsep.join(
+                filter(None, [str(BACKEND_DIR.resolve()), os.environ.get("PYTHONPATH")])
+            ),
+        )
+        for target in args.targets:
+            print(f"Importing {target} ({args.runs} runs)")
+            # Warm-up run, so every measured run reads .pyc files from the OS cache
+            if import_profile(target, env, tmp) is None:
+                continue
+            runs = [import_profile(target, env, tmp) for _ in range(args.runs)]
+            runs = [run for run in runs if run is not None]
+            for package in set().union(*runs):
+                timings = [run.get(package, 0.0) for run in runs]
+                rows.append(
+                    {
+                        "target": target,
+                        "package": package,
+                        "median_ms": round(statistics.median(timings), 2),
+                        "max_ms": round(max(timings), 2),
+                        "runs": len(runs),
+                    }
+                )
+
+    df = pd.DataFrame(rows).sort_values(
+        ["target", "median_ms"], ascending=[True, False]
+    )
+    df.to_csv(OUTPUT_CSV_PATH, index=False)
+    for target, group in df.groupby("target", sort=False):
+        print(f"\n{target}")
+        print(group.head(args.top + 1).to_string(index=False))
+    print(f"\nResults saved to {OUTPUT_CSV_PATH}")
+
+
+if __name__ == "__main__":
+    main()
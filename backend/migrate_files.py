@@ -3,7 +3,9 @@
 File migration utility for AI Study Companion.
 
 This script migrates files from potential old locations to the correct location
-after the frontend and backend were merged.
+after the frontend and backend were merged, and moves files stored in the old
+flat upload directory into the sharded layout (uploaded_sources/ab/cd/<id>.pdf).
+All moves are recorded in the file storage index.
 """
 
 import logging
@@ -12,6 +14,8 @@ import shutil
 import sqlite3
 from pathlib import Path
 
+from app.services.file_storage import file_storage
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -106,10 +110,12 @@ def migrate_files():
         logger.info(f"Processing source: {source_id} ({filename})")
 
         # Check if file already exists in target location
-        target_path = target_dir / f"{source_id}.pdf"
-        if target_path.exists():
-            logger.info(f"File already exists at target location: {target_path}")
+        if file_storage.file_exists(source_id):
+            logger.info(
+                f"File already exists at target location: {file_storage.get_file_path(source_id)}"
+            )
             continue
+        target_path = file_storage.sharded_path(source_id)
 
         # Find file in possible locations
         found_paths = find_file_in_paths(source_id)
@@ -122,7 +128,9 @@ def migrate_files():
         try:
             source_path = found_paths[0]
             logger.info(f"Copying {source_path} -> {target_path}")
+            target_path.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy2(source_path, target_path)
+            file_storage.register(source_id, target_path)
             logger.info(f"Successfully migrated file for source: {source_id}")
             migrated += 1
         except Exception as e:
@@ -132,6 +140,10 @@ def migrate_files():
         f"Migration complete. Migrated {migrated} files out of {len(sources)} sources."
     )
 
+    # Move files left in the flat layout into their shard directories
+    moved = file_storage.migrate_layout()
+    logger.info(f"Moved {moved} files into the sharded layout.")
+
 
 if __name__ == "__main__":
     logger.info("Starting file migration")